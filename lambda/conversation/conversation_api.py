@@ -4,8 +4,13 @@ import uuid
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 import os
+import logging
 from decimal import Decimal
 
+# 로깅 설정 (디버그 로그는 LOG_LEVEL=DEBUG일 때만 출력)
+logger = logging.getLogger()
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
+
 dynamodb = boto3.resource('dynamodb')
 conversations_table = dynamodb.Table(os.environ['CONVERSATIONS_TABLE'])
 messages_table = dynamodb.Table(os.environ['MESSAGES_TABLE'])
@@ -48,8 +53,10 @@ def handler(event, context):
             }
         
         print(f"요청: {http_method} {path}, 사용자: {user_sub}")
-        print(f"DEBUG - Full user claims: {event.get('requestContext', {}).get('authorizer', {}).get('claims', {})}")
-        print(f"DEBUG - User email: {event.get('requestContext', {}).get('authorizer', {}).get('claims', {}).get('email', 'N/A')}")
+        if logger.isEnabledFor(logging.DEBUG):
+            claims = event.get('requestContext', {}).get('authorizer', {}).get('claims', {})
+            logger.debug("Full user claims: %s", claims)
+            logger.debug("User email: %s", claims.get('email', 'N/A'))
         
         # 라우팅 로직
         if http_method == 'GET' and path == '/conversations':
@@ -98,8 +105,8 @@ def get_conversations(user_sub: str, query_params: Dict) -> Dict:
     cursor = query_params.get('cursor')
     
     try:
-        print(f"DEBUG - 대화 목록 조회 시작: user_sub={user_sub}")
-        print(f"DEBUG - GSI1PK 값: USER#{user_sub}")
+        logger.debug("대화 목록 조회 시작: user_sub=%s", user_sub)
+        logger.debug("GSI1PK 값: USER#%s", user_sub)
         
         # Query conversations using GSI
         query_kwargs = {
@@ -133,9 +140,10 @@ def get_conversations(user_sub: str, query_params: Dict) -> Dict:
         response = conversations_table.query(**query_kwargs)
         items = response.get('Items', [])
         
-        print(f"DEBUG - DynamoDB 쿼리 결과: {len(items)}개 대화 발견")
-        for item in items:
-            print(f"DEBUG - 대화: PK={item.get('PK')}, SK={item.get('SK')}, title={item.get('title')}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("DynamoDB 쿼리 결과: %d개 대화 발견", len(items))
+            for item in items:
+                logger.debug("대화: PK=%s, SK=%s, title=%s", item.get('PK'), item.get('SK'), item.get('title'))
         
         # Check if there are more items
         has_more = len(items) > limit
@@ -318,9 +326,9 @@ def delete_conversation(user_sub: str, conversation_id: str) -> Dict:
             }
         
         # 2. 관련된 모든 메시지 삭제 (배치 삭제)
+        deleted_messages = 0
         try:
             # 메시지들을 페이지네이션으로 조회하면서 삭제
-            deleted_messages = 0
             last_evaluated_key = None
             
             while True:
@@ -376,7 +384,7 @@ def delete_conversation(user_sub: str, conversation_id: str) -> Dict:
             'body': json.dumps({
                 'success': True,
                 'message': '대화가 성공적으로 삭제되었습니다',
-                'deletedMessages': deleted_messages if 'deleted_messages' in locals() else 0
+                'deletedMessages': deleted_messages
             })
         }
         
@@ -8,6 +8,7 @@
 import json
 import re
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional, Union
 import pytz
 from dateutil import parser
@@ -16,6 +17,16 @@ import logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# S3 메타데이터 날짜 형식
+S3_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"  # 2025-07-02T00:00:00.000+09:00
+_KST = pytz.timezone('Asia/Seoul')
+
+@lru_cache(maxsize=2048)
+def _format_s3_date_readable(s3_date_str: str) -> str:
+    """S3 발행일 문자열 → 한국어 표기 (같은 발행일은 파싱 없이 캐시에서 반환, 실패는 캐시하지 않음)"""
+    dt = datetime.strptime(s3_date_str, S3_DATE_FORMAT)
+    return dt.astimezone(_KST).strftime("%Y년 %m월 %d일 %H시 %M분")
+
 class DateIntelligenceProcessor:
     """
     뉴스 서비스를 위한 고급 날짜 처리 엔진
@@ -27,7 +38,7 @@ class DateIntelligenceProcessor:
         self.current_time_kst = datetime.now(self.kst)
         
         # S3 메타데이터 날짜 형식
-        self.s3_date_format = "%Y-%m-%dT%H:%M:%S.%f%z"  # 2025-07-02T00:00:00.000+09:00
+        self.s3_date_format = S3_DATE_FORMAT
         
         # 날짜 표현 패턴 (확장된 버전)
         self.patterns = {
@@ -92,11 +103,33 @@ class DateIntelligenceProcessor:
                 r'실시간', r'라이브', r'속보'
             ]
         }
+        
+        # 감지용 정규식 사전 컴파일 (카테고리별 결합 패턴으로 매칭 없는 카테고리는 한 번에 건너뜀)
+        self._compiled_patterns = {}
+        self._category_matchers = {}
+        for category in ("relative_time", "specific_period", "absolute_date", "seasons"):
+            category_patterns = self.patterns[category]
+            if isinstance(category_patterns, dict):
+                compiled = [(re.compile(p, re.IGNORECASE), v) for p, v in category_patterns.items()]
+            else:
+                compiled = [(re.compile(p, re.IGNORECASE), None) for p in category_patterns]
+            self._compiled_patterns[category] = compiled
+            self._category_matchers[category] = re.compile(
+                "|".join(f"(?:{p})" for p in category_patterns), re.IGNORECASE
+            )
+        
+        # 신선도 키워드는 서로 겹치지 않는 리터럴이므로 결합 패턴 한 번의 스캔으로 고유 매칭 수를 센다
+        self._freshness_matcher = re.compile("|".join(self.patterns["freshness"]), re.IGNORECASE)
+        self._urgent_freshness_matcher = re.compile(r'실시간|속보|긴급', re.IGNORECASE)
     
     def analyze_query_temporal_expressions(self, query: str) -> Dict:
         """
         질문에서 시간 표현을 종합적으로 분석
         """
+        # 인스턴스가 웜 컨테이너에서 재사용되므로 기준 시각을 호출마다 갱신
+        # (상대 날짜 결과가 기준 시각에 따라 달라지므로 분석 결과는 캐시하지 않음)
+        self.current_time_kst = datetime.now(self.kst)
+        
         analysis_result = {
             "query": query,
             "current_time_kst": self.current_time_kst.isoformat(),
@@ -161,10 +194,11 @@ class DateIntelligenceProcessor:
     def _detect_relative_time(self, query: str) -> List[Dict]:
         """상대적 시간 표현 감지"""
         results = []
+        if not self._category_matchers["relative_time"].search(query):
+            return results
         
-        for pattern, (offset, unit) in self.patterns["relative_time"].items():
-            matches = re.finditer(pattern, query, re.IGNORECASE)
-            for match in matches:
+        for regex, (offset, unit) in self._compiled_patterns["relative_time"]:
+            for match in regex.finditer(query):
                 results.append({
                     "expression": match.group(),
                     "type": "relative",
@@ -178,10 +212,11 @@ class DateIntelligenceProcessor:
     def _detect_specific_period(self, query: str) -> List[Dict]:
         """구체적 기간 표현 감지 (N일 전, N년 전 등)"""
         results = []
+        if not self._category_matchers["specific_period"].search(query):
+            return results
         
-        for pattern, (unit, direction) in self.patterns["specific_period"].items():
-            matches = re.finditer(pattern, query, re.IGNORECASE)
-            for match in matches:
+        for regex, (unit, direction) in self._compiled_patterns["specific_period"]:
+            for match in regex.finditer(query):
                 try:
                     # 숫자 추출
                     number = int(match.group(1))
@@ -201,10 +236,11 @@ class DateIntelligenceProcessor:
     def _detect_absolute_date(self, query: str) -> List[Dict]:
         """절대 날짜 표현 감지"""
         results = []
+        if not self._category_matchers["absolute_date"].search(query):
+            return results
         
-        for pattern in self.patterns["absolute_date"]:
-            matches = re.finditer(pattern, query, re.IGNORECASE)
-            for match in matches:
+        for regex, _ in self._compiled_patterns["absolute_date"]:
+            for match in regex.finditer(query):
                 results.append({
                     "expression": match.group(),
                     "type": "absolute_date",
@@ -217,10 +253,11 @@ class DateIntelligenceProcessor:
     def _detect_seasons(self, query: str) -> List[Dict]:
         """계절 및 분기 표현 감지"""
         results = []
+        if not self._category_matchers["seasons"].search(query):
+            return results
         
-        for pattern, months in self.patterns["seasons"].items():
-            matches = re.finditer(pattern, query, re.IGNORECASE)
-            for match in matches:
+        for regex, months in self._compiled_patterns["seasons"]:
+            for match in regex.finditer(query):
                 # months는 tuple로, 시작월과 끝월을 계산
                 start_month = min(months)
                 end_month = max(months)
@@ -474,14 +511,11 @@ class DateIntelligenceProcessor:
     
     def _calculate_freshness_priority(self, query: str) -> float:
         """신선도 우선순위 계산 (0.0-1.0)"""
-        freshness_score = 0.0
-        
-        for pattern in self.patterns["freshness"]:
-            if re.search(pattern, query, re.IGNORECASE):
-                freshness_score += 0.2
+        matched_keywords = set(self._freshness_matcher.findall(query))
+        freshness_score = 0.2 * len(matched_keywords)
         
         # 특별한 키워드는 더 높은 점수
-        if re.search(r'실시간|속보|긴급', query, re.IGNORECASE):
+        if self._urgent_freshness_matcher.search(query):
             freshness_score += 0.4
         
         return min(freshness_score, 1.0)
@@ -547,9 +581,9 @@ class DateIntelligenceProcessor:
             start_date = parser.isoparse(date_range["start_date"])
             end_date = parser.isoparse(date_range["end_date"])
             
-            # S3 메타데이터 형식으로 변환
-            s3_start = start_date.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + start_date.strftime("%z")
-            s3_end = end_date.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + end_date.strftime("%z")
+            # S3 메타데이터 형식으로 변환 (밀리초 + "+09:00" 오프셋을 한 번에 생성)
+            s3_start = start_date.isoformat(timespec="milliseconds")
+            s3_end = end_date.isoformat(timespec="milliseconds")
             
             return {
                 "published_date_filter": {
@@ -576,9 +610,7 @@ class DateIntelligenceProcessor:
         S3 메타데이터 날짜를 읽기 쉬운 형식으로 변환
         """
         try:
-            dt = datetime.strptime(s3_date_str, self.s3_date_format)
-            kst_dt = dt.astimezone(self.kst)
-            return kst_dt.strftime("%Y년 %m월 %d일 %H시 %M분")
+            return _format_s3_date_readable(s3_date_str)
         except Exception as e:
             logger.warning(f"날짜 변환 오류: {str(e)}")
             return s3_date_str
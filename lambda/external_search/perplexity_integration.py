@@ -7,20 +7,57 @@ Perplexity API 통합 시스템
 """
 import json
 import os
+import re
+import sys
 import time
 import hashlib
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-import urllib.request
+from typing import Dict, List, Optional, Any, Tuple
+import http.client
 import urllib.parse
-import urllib.error
 import boto3
 import logging
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / 'utils'))
+from common_utils import json_dumps, json_loads
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# 신뢰도 가산 대상 언론사 도메인
+TRUSTED_DOMAINS = ("sedaily.com", "yonhapnews.co.kr", "chosun.com", "joongang.co.kr")
+
+# 검색 최적화 키워드 (도메인 순서대로 검사, 먼저 걸린 도메인만 반영)
+SEARCH_ENHANCERS = {
+    "경제": ("경제", "금융", "증시", "주가", "실적"),
+    "기업": ("기업", "회사", "CEO", "사업", "경영"),
+    "정치": ("정부", "정책", "법안", "정치", "국회"),
+    "기술": ("기술", "IT", "혁신", "개발", "디지털"),
+    "시장": ("시장", "산업", "동향", "트렌드", "전망")
+}
+
+# 도메인별 쿼리 보강 문구 (없는 도메인은 매칭되어도 보강하지 않음)
+DOMAIN_QUERY_SUFFIXES = {
+    "경제": " 경제뉴스",
+    "기업": " 기업뉴스"
+}
+
+# 도메인별 키워드 결합 정규식 사전 컴파일 - 키워드마다 쿼리를 다시 훑지 않고 도메인당 한 번 스캔
+_DOMAIN_KEYWORD_PATTERNS = tuple(
+    (re.compile("|".join(map(re.escape, keywords))), DOMAIN_QUERY_SUFFIXES.get(domain, ""))
+    for domain, keywords in SEARCH_ENHANCERS.items()
+)
+
+# 검색 결과 캐시 저장용 단일 워커 (검색 결과 반환을 DynamoDB 쓰기 대기 없이 진행)
+# Lambda는 핸들러 반환 후 실행 환경을 동결하므로 핸들러는 반환 전에 wait_for_pending_writes()로 완료를 기다려야 함
+_persist_executor = ThreadPoolExecutor(max_workers=1)
+
+class _PerplexityHTTPError(Exception):
+    """Perplexity API가 4xx/5xx를 반환한 경우 (이미 로깅됨)"""
+
 @dataclass
 class SearchResult:
     """검색 결과 데이터 클래스"""
@@ -40,6 +77,12 @@ class PerplexitySearchAgent:
         self.api_key = os.environ.get("PERPLEXITY_API_KEY")
         self.api_url = "https://api.perplexity.ai/chat/completions"
         
+        # 웜 컨테이너에서 재사용하는 keep-alive HTTPS 연결 (호출마다 TCP/TLS 핸드셰이크 생략)
+        api_url_parts = urllib.parse.urlsplit(self.api_url)
+        self._api_host = api_url_parts.netloc
+        self._api_path = api_url_parts.path
+        self._api_connection = None
+        
         # DynamoDB 캐싱용 테이블
         self.dynamodb = boto3.client("dynamodb", region_name=os.environ.get("REGION", "ap-northeast-2"))
         self.cache_table = os.environ.get("PERPLEXITY_CACHE_TABLE", "perplexity-search-cache")
@@ -51,18 +94,16 @@ class PerplexitySearchAgent:
             "temperature": 0.1,  # 일관성 있는 결과
             "timeout": 30,       # 30초 타임아웃
             "cache_ttl": 3600,   # 1시간 캐시
+            "cache_write_timeout": 5,  # 백그라운드 캐시 저장 대기 한도 (초)
             "daily_limit": 1000,  # 일일 검색 제한
             "min_confidence": 0.7  # 최소 신뢰도
         }
         
         # 검색 최적화 키워드
-        self.search_enhancers = {
-            "경제": ["경제", "금융", "증시", "주가", "실적"],
-            "기업": ["기업", "회사", "CEO", "사업", "경영"],
-            "정치": ["정부", "정책", "법안", "정치", "국회"],
-            "기술": ["기술", "IT", "혁신", "개발", "디지털"],
-            "시장": ["시장", "산업", "동향", "트렌드", "전망"]
-        }
+        self.search_enhancers = SEARCH_ENHANCERS
+        
+        # 아직 끝나지 않았을 수 있는 백그라운드 캐시 저장 작업
+        self._pending_writes = []
         
     def search_external_knowledge(self, 
                                  query: str, 
@@ -83,7 +124,7 @@ class PerplexitySearchAgent:
             # 3. 캐시 확인
             cached_result = self._get_cached_result(query)
             if cached_result:
-                logger.info(f"캐시된 결과 반환: {query}")
+                logger.info("캐시된 결과 반환: %s", query)
                 return cached_result
 
             # 4. 쿼리 최적화
@@ -95,17 +136,17 @@ class PerplexitySearchAgent:
             # 6. 결과 파싱 및 검증
             parsed_result = self._parse_and_validate_result(raw_result, query)
 
-            # 7. 캐싱
-            self._cache_result(query, parsed_result)
-
-            # 8. 사용량 기록
+            # 7. 사용량 기록 - 일일 제한 판단 근거이므로 응답 전에 동기 기록
             self._record_usage(parsed_result.token_usage)
 
-            logger.info(f"외부 검색 완료: {query} (신뢰도: {parsed_result.confidence:.2f})")
+            # 8. 캐싱 (백그라운드, 핸들러 종료 전 wait_for_pending_writes로 완료 대기)
+            self._pending_writes.append(_persist_executor.submit(self._cache_result, query, parsed_result))
+
+            logger.info("외부 검색 완료: %s (신뢰도: %.2f)", query, parsed_result.confidence)
             return parsed_result
 
         except Exception as e:
-            logger.error(f"외부 검색 오류: {str(e)}")
+            logger.error("외부 검색 오류: %s", e)
             return self._get_error_result(query, str(e))
     
     # SmartQueryRouter 호환성을 위한 별칭
@@ -169,25 +210,19 @@ class PerplexitySearchAgent:
         
         final_query = f"{search_instructions}\n\n질문: {enhanced_query}"
         
-        logger.info(f"최적화된 쿼리: {final_query[:100]}...")
+        logger.info("최적화된 쿼리: %s...", final_query[:100])
         return final_query
     
     def _enhance_with_domain_keywords(self, query: str) -> str:
         """
         도메인별 키워드로 쿼리 강화
         """
-        enhanced_query = query
-        
         # 기업명이 있으면 관련 키워드 추가
-        for domain, keywords in self.search_enhancers.items():
-            if any(keyword in query for keyword in keywords):
-                if domain == "경제":
-                    enhanced_query += " 경제뉴스"
-                elif domain == "기업":
-                    enhanced_query += " 기업뉴스"
-                break
+        for pattern, suffix in _DOMAIN_KEYWORD_PATTERNS:
+            if pattern.search(query):
+                return query + suffix
         
-        return enhanced_query
+        return query
     
     def _call_perplexity_api(self, query: str) -> Dict:
         """
@@ -218,36 +253,61 @@ class PerplexitySearchAgent:
         }
         
         try:
-            # HTTP 요청 생성
-            req = urllib.request.Request(
-                self.api_url,
-                data=json.dumps(payload).encode('utf-8'),
-                headers=headers
-            )
-            
             # API 호출
-            start_time = time.time()
-            with urllib.request.urlopen(req, timeout=self.config["timeout"]) as response:
-                response_data = json.loads(response.read().decode('utf-8'))
+            start_time = time.perf_counter()
+            status, response_body = self._post_api(json_dumps(payload).encode('utf-8'), headers)
+            
+            if status >= 400:
+                error_body = response_body.decode('utf-8', errors='replace') or "No error body"
+                logger.error("Perplexity API HTTP 오류 %s: %s", status, error_body)
+                raise _PerplexityHTTPError(f"API 호출 실패: HTTP {status}")
             
-            elapsed_time = time.time() - start_time
-            logger.info(f"Perplexity API 호출 완료: {elapsed_time:.2f}초")
+            response_data = json_loads(response_body)
+            
+            elapsed_time = time.perf_counter() - start_time
+            logger.info("Perplexity API 호출 완료: %.2f초", elapsed_time)
             
             return response_data
             
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode('utf-8') if e.fp else "No error body"
-            logger.error(f"Perplexity API HTTP 오류 {e.code}: {error_body}")
-            raise Exception(f"API 호출 실패: HTTP {e.code}")
+        except _PerplexityHTTPError:
+            raise
             
-        except urllib.error.URLError as e:
-            logger.error(f"Perplexity API URL 오류: {str(e)}")
+        except (http.client.HTTPException, OSError) as e:
+            logger.error("Perplexity API URL 오류: %s", e)
             raise Exception(f"네트워크 오류: {str(e)}")
             
         except Exception as e:
-            logger.error(f"Perplexity API 호출 중 예상치 못한 오류: {str(e)}")
+            logger.error("Perplexity API 호출 중 예상치 못한 오류: %s", e)
             raise
     
+    def _post_api(self, body: bytes, headers: Dict) -> Tuple[int, bytes]:
+        """
+        keep-alive 연결로 POST 후 (상태 코드, 응답 본문) 반환
+        재사용한 연결이 서버 측에서 이미 닫혀 있던 경우에만 새 연결로 한 번 재시도
+        """
+        reused = self._api_connection is not None
+        if not reused:
+            self._api_connection = http.client.HTTPSConnection(self._api_host, timeout=self.config["timeout"])
+        
+        try:
+            self._api_connection.request("POST", self._api_path, body=body, headers=headers)
+            response = self._api_connection.getresponse()
+            return response.status, response.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            self._close_api_connection()
+            if not reused:
+                raise
+            return self._post_api(body, headers)
+        except Exception:
+            self._close_api_connection()
+            raise
+    
+    def _close_api_connection(self):
+        """연결 정리 (다음 호출 시 새로 연결)"""
+        if self._api_connection is not None:
+            self._api_connection.close()
+            self._api_connection = None
+    
     def _parse_and_validate_result(self, raw_result: Dict, original_query: str) -> SearchResult:
         """
         API 결과 파싱 및 검증
@@ -277,7 +337,7 @@ class PerplexitySearchAgent:
             
             # 결과 검증
             if confidence < self.config["min_confidence"]:
-                logger.warning(f"낮은 신뢰도 결과: {confidence}")
+                logger.warning("낮은 신뢰도 결과: %s", confidence)
             
             return SearchResult(
                 content=content,
@@ -289,7 +349,7 @@ class PerplexitySearchAgent:
             )
             
         except Exception as e:
-            logger.error(f"결과 파싱 오류: {str(e)}")
+            logger.error("결과 파싱 오류: %s", e)
             # Fallback 결과
             return SearchResult(
                 content=f"검색 결과 처리 중 오류가 발생했습니다: {str(e)}",
@@ -308,21 +368,23 @@ class PerplexitySearchAgent:
         
         # citations가 예상과 다른 형태일 수 있으므로 안전하게 처리
         if not isinstance(citations, list):
-            logger.warning(f"Citations이 리스트가 아님: {type(citations)}")
+            logger.warning("Citations이 리스트가 아님: %s", type(citations))
             return sources
         
         for i, citation in enumerate(citations[:5], 1):  # 최대 5개 출처
             # citation이 dict가 아닌 경우 안전하게 처리
             if not isinstance(citation, dict):
-                logger.warning(f"Citation이 dict가 아님: {type(citation)}")
+                logger.warning("Citation이 dict가 아님: %s", type(citation))
                 continue
-                
+            
+            url = citation.get("url", "")
+            text = citation.get("text", "")
             source = {
                 "index": i,
                 "title": citation.get("title", f"출처 {i}"),
-                "url": citation.get("url", ""),
-                "domain": self._extract_domain(citation.get("url", "")),
-                "snippet": citation.get("text", "")[:200] + "..." if len(citation.get("text", "")) > 200 else citation.get("text", "")
+                "url": url,
+                "domain": self._extract_domain(url),
+                "snippet": text[:200] + "..." if len(text) > 200 else text
             }
             sources.append(source)
         
@@ -331,41 +393,30 @@ class PerplexitySearchAgent:
     def _extract_domain(self, url: str) -> str:
         """URL에서 도메인 추출"""
         try:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
+            parsed = urllib.parse.urlparse(url)
             return parsed.netloc
-        except:
+        except (ValueError, TypeError, AttributeError):  # 잘못된 URL 또는 문자열이 아닌 값
             return url
     
     def _calculate_confidence(self, content: str, sources: List[Dict], token_usage: int) -> float:
         """
         검색 결과 신뢰도 계산
         """
-        confidence = 0.5  # 기본 점수
-        
-        # 내용 길이 평가
-        if len(content) > 100:
-            confidence += 0.1
-        if len(content) > 300:
-            confidence += 0.1
-        
-        # 출처 개수 평가
+        content_length = len(content)
         source_count = len(sources)
-        if source_count >= 3:
-            confidence += 0.2
-        elif source_count >= 1:
-            confidence += 0.1
-        
-        # 신뢰할 수 있는 도메인 확인
-        trusted_domains = ["sedaily.com", "yonhapnews.co.kr", "chosun.com", "joongang.co.kr"]
-        for source in sources:
-            if any(domain in source.get("domain", "") for domain in trusted_domains):
-                confidence += 0.1
-                break
+        has_trusted_source = any(
+            domain in source.get("domain", "") for source in sources for domain in TRUSTED_DOMAINS
+        )
         
-        # 토큰 사용량으로 상세도 평가
-        if token_usage > 500:
-            confidence += 0.1
+        # 분기 없이 조건(bool)을 가중치에 곱해 합산 - 항목 순서는 기존 가산 순서와 동일
+        confidence = (
+            0.5                                                  # 기본 점수
+            + 0.1 * (content_length > 100)                       # 내용 길이
+            + 0.1 * (content_length > 300)
+            + 0.1 * ((source_count >= 1) + (source_count >= 3))  # 출처 개수 (1개 이상 0.1, 3개 이상 0.2)
+            + 0.1 * has_trusted_source                           # 신뢰할 수 있는 도메인
+            + 0.1 * (token_usage > 500)                          # 토큰 사용량으로 상세도 평가
+        )
         
         return min(confidence, 1.0)
     
@@ -386,7 +437,7 @@ class PerplexitySearchAgent:
             return True  # 첫 사용
             
         except Exception as e:
-            logger.warning(f"일일 제한 확인 오류: {str(e)}")
+            logger.warning("일일 제한 확인 오류: %s", e)
             return True  # 오류 시 허용
     
     def _get_cached_result(self, query: str) -> Optional[SearchResult]:
@@ -405,11 +456,11 @@ class PerplexitySearchAgent:
                 # TTL 확인
                 cache_time = datetime.fromisoformat(item["timestamp"]["S"])
                 if datetime.now() - cache_time < timedelta(seconds=self.config["cache_ttl"]):
-                    logger.info(f"캐시 히트: {query}")
+                    logger.info("캐시 히트: %s", query)
                     
                     return SearchResult(
                         content=item["content"]["S"],
-                        sources=json.loads(item["sources"]["S"]),
+                        sources=json_loads(item["sources"]["S"]),
                         query=query,
                         timestamp=item["timestamp"]["S"],
                         confidence=float(item["confidence"]["N"]),
@@ -419,7 +470,7 @@ class PerplexitySearchAgent:
             return None
             
         except Exception as e:
-            logger.warning(f"캐시 조회 오류: {str(e)}")
+            logger.warning("캐시 조회 오류: %s", e)
             return None
     
     def _cache_result(self, query: str, result: SearchResult):
@@ -432,7 +483,7 @@ class PerplexitySearchAgent:
                 Item={
                     "query_hash": {"S": query_hash},
                     "content": {"S": result.content},
-                    "sources": {"S": json.dumps(result.sources, ensure_ascii=False)},
+                    "sources": {"S": json_dumps(result.sources)},
                     "timestamp": {"S": result.timestamp},
                     "confidence": {"N": str(result.confidence)},
                     "token_usage": {"N": str(result.token_usage)},
@@ -441,7 +492,16 @@ class PerplexitySearchAgent:
             )
             
         except Exception as e:
-            logger.warning(f"캐싱 오류: {str(e)}")
+            logger.warning("캐싱 오류: %s", e)
+    
+    def wait_for_pending_writes(self):
+        """백그라운드 캐시 저장 완료 대기 (Lambda 핸들러 반환 전 호출, 저장 오류는 _cache_result에서 처리)"""
+        if not self._pending_writes:
+            return
+        _, not_done = wait(self._pending_writes, timeout=self.config["cache_write_timeout"])
+        if not_done:
+            logger.warning("캐시 저장 %s건이 제한 시간 내에 끝나지 않았습니다.", len(not_done))
+        self._pending_writes.clear()
     
     def _record_usage(self, token_usage: int):
         """사용량 기록"""
@@ -460,7 +520,7 @@ class PerplexitySearchAgent:
             )
             
         except Exception as e:
-            logger.warning(f"사용량 기록 오류: {str(e)}")
+            logger.warning("사용량 기록 오류: %s", e)
     
     def _generate_query_hash(self, query: str) -> str:
         """쿼리 해시 생성"""
@@ -520,8 +580,6 @@ if __name__ == "__main__":
         "date_strategy": {"priority": "latest_first"}
     }
     
-    agent = PerplexitySearchAgent()
-    
     # 테스트 검색
     test_queries = [
         "삼양식품 최신 주가 동향",
@@ -529,8 +587,14 @@ if __name__ == "__main__":
         "최근 반도체 시장 이슈"
     ]
     
-    for query in test_queries:
-        print(f"\n=== 테스트 검색: {query} ===")
-        result = agent.search_external_knowledge(query, test_context)
-        formatted = format_search_result_for_display(result)
-        print(json.dumps(formatted, ensure_ascii=False, indent=2)) 
\ No newline at end of file
+    # 검색은 동시에 실행하고 출력은 질문 순서대로
+    # (에이전트의 keep-alive 연결은 스레드 간 동시 사용 불가 - 질문별 에이전트 사용)
+    with ThreadPoolExecutor(max_workers=len(test_queries)) as executor:
+        results = executor.map(
+            lambda q: PerplexitySearchAgent().search_external_knowledge(q, test_context), test_queries
+        )
+        
+        for query, result in zip(test_queries, results):
+            print(f"\n=== 테스트 검색: {query} ===")
+            formatted = format_search_result_for_display(result)
+            print(json.dumps(formatted, ensure_ascii=False, indent=2))
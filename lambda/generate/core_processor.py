@@ -3,11 +3,14 @@
 공통 로직 중앙화로 중복 제거 및 유지보수성 향상
 """
 
-import json
+import heapq
+import io
+import re
 import boto3
 import os
 import logging
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import sys
 from pathlib import Path
@@ -17,30 +20,42 @@ sys.path.append(str(Path(__file__).parent.parent / 'date_intelligence'))
 sys.path.append(str(Path(__file__).parent.parent / 'external_search'))
 sys.path.append(str(Path(__file__).parent.parent / 'utils'))
 
-try:
-    from date_processor import DateIntelligenceProcessor
-    from perplexity_integration import PerplexitySearchAgent
-    from common_utils import DecimalEncoder
-    from apac_model_manager import APACModelManager
-except ImportError as e:
-    logger.error(f"모듈 import 오류: {e}")
-
 # 로깅 설정
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# 필수 공통 모듈 (모듈 수준 클라이언트/캐시가 의존하므로 실패 시 바로 import 오류로 드러나도록 보호하지 않음)
+# date_processor(dateutil/pytz), perplexity_integration은 처음 필요할 때 import (지연 로딩)
+from common_utils import json_dumps, json_loads, BOTO3_CLIENT_CONFIG, TTLCache
+from date_meta_handler import KST, is_date_meta_question, generate_date_meta_response
+
 # AWS 클라이언트 초기화 (서울리전)
 bedrock_runtime = boto3.client(
     service_name='bedrock-runtime',
-    region_name=os.environ.get('AWS_REGION', 'ap-northeast-2')
+    region_name=os.environ.get('AWS_REGION', 'ap-northeast-2'),
+    config=BOTO3_CLIENT_CONFIG
 )
 
 bedrock_agent_runtime = boto3.client(
     service_name='bedrock-agent-runtime', 
-    region_name=os.environ.get('AWS_REGION', 'ap-northeast-2')
+    region_name=os.environ.get('AWS_REGION', 'ap-northeast-2'),
+    config=BOTO3_CLIENT_CONFIG
 )
 
-s3_client = boto3.client('s3', region_name=os.environ.get('AWS_REGION', 'ap-northeast-2'))
+# 내부/외부 검색 동시 실행용 스레드 풀 (웜 컨테이너에서 재사용)
+_search_executor = ThreadPoolExecutor(max_workers=2)
+
+# 동일 질문 반복 시 전체 플로우 결과 재사용 (날짜 키 포함으로 자정이 지나면 자동 무효화)
+# 실시간 키워드 질문과 외부 검색(Perplexity) 결과로 만든 답변은 캐시하지 않음
+RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', '900'))
+_response_cache = TTLCache(maxsize=256, ttl=RESPONSE_CACHE_TTL)
+
+# Knowledge Base 검색 결과 단기 캐시 (재시도/연속 질문 시 retrieve 왕복 생략, 성공 결과만 저장)
+KB_CACHE_TTL = int(os.environ.get('KB_CACHE_TTL', '60'))
+_kb_cache = TTLCache(maxsize=256, ttl=KB_CACHE_TTL)
+
+# 생성 실패 시 응답 접두어 (실패 응답은 캐시하지 않음)
+GENERATION_ERROR_PREFIX = "죄송합니다. 답변 생성 중 오류가 발생했습니다"
 
 # 환경 변수 - CDK 스택과 동일한 값들
 KNOWLEDGE_BASE_ID = os.environ.get('KNOWLEDGE_BASE_ID', 'PGQV3JXPET')
@@ -61,6 +76,35 @@ SUPPORTED_CLAUDE_MODELS = {
 
 DEFAULT_MODEL_ID = "apac.anthropic.claude-3-5-sonnet-20240620-v1:0"
 
+# 외부 검색이 필요한 키워드 - 최신 정보 요청 + 특정 업종/테마 관련
+RECENT_KEYWORDS = ('실시간', '현재', '오늘', '최신', '방금', '지금')
+SPECIFIC_KEYWORDS = ('주가', '실적', '정책', '규제', '발표', '뉴스')
+
+# 키워드 전체를 하나의 정규식으로 묶어 질문을 한 번만 스캔
+_EXTERNAL_SEARCH_KEYWORD_PATTERN = re.compile(
+    '|'.join(map(re.escape, RECENT_KEYWORDS + SPECIFIC_KEYWORDS))
+)
+# 최신 정보 요청 여부 (응답 캐시 우회 판단용)
+_RECENT_KEYWORD_PATTERN = re.compile('|'.join(map(re.escape, RECENT_KEYWORDS)))
+
+# 내부 프롬프트 - 서울경제신문 AI 요약 시스템 전용 (요청마다 재생성하지 않는 모듈 상수)
+SYSTEM_PROMPT = """당신은 서울경제신문의 전문 AI 기자입니다. 
+사용자의 질문에 대해 제공된 뉴스 자료를 바탕으로 정확하고 신뢰성 있는 답변을 제공하세요.
+
+답변 구조:
+1. 핵심 요약 (2-3문장)
+2. 상세 분석 (관련 데이터 및 맥락 포함)
+3. 시장/사회적 영향
+4. 전망 및 의견
+
+답변 원칙:
+- 제공된 뉴스 자료를 기반으로 작성
+- 정확한 수치와 날짜 인용
+- 균형잡힌 시각으로 분석
+- 전문적이면서도 이해하기 쉬운 설명
+- 불확실한 정보는 명시
+"""
+
 class NewsProcessor:
     """서울경제신문 뉴스 처리 핵심 엔진"""
     
@@ -91,7 +135,7 @@ class NewsProcessor:
                     'error': 'KNOWLEDGE_BASE_ID 환경변수가 설정되지 않았습니다.'
                 }
             
-            logger.info(f"🔍 Knowledge Base 연결 테스트: {KNOWLEDGE_BASE_ID}")
+            logger.info("🔍 Knowledge Base 연결 테스트: %s", KNOWLEDGE_BASE_ID)
             
             # 간단한 테스트 쿼리 실행
             test_query = "서울경제신문 테스트"
@@ -106,7 +150,7 @@ class NewsProcessor:
             )
             
             results = response.get('retrievalResults', [])
-            logger.info(f"✅ Knowledge Base 연결 성공! 테스트 결과: {len(results)}개")
+            logger.info("✅ Knowledge Base 연결 성공! 테스트 결과: %s개", len(results))
             
             return {
                 'success': True,
@@ -116,7 +160,7 @@ class NewsProcessor:
             }
             
         except Exception as e:
-            logger.error(f"❌ Knowledge Base 연결 실패: {e}")
+            logger.error("❌ Knowledge Base 연결 실패: %s", e)
             return {
                 'success': False,
                 'error': str(e),
@@ -127,7 +171,7 @@ class NewsProcessor:
         """Claude 모델 연결 테스트"""
         try:
             model_id = self.get_model_id(model_tier)
-            logger.info(f"🤖 Claude 모델 테스트: {model_id}")
+            logger.info("🤖 Claude 모델 테스트: %s", model_id)
             
             # 간단한 테스트 메시지
             test_prompt = "안녕하세요, 테스트입니다. 간단히 인사해주세요."
@@ -136,7 +180,7 @@ class NewsProcessor:
             if "claude-3" in model_id:
                 body = {
                     "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": 1000,
+                    "max_tokens": 100,
                     "messages": [
                         {
                             "role": "user",
@@ -153,17 +197,17 @@ class NewsProcessor:
             
             response = bedrock_runtime.invoke_model(
                 modelId=model_id,
-                body=json.dumps(body)
+                body=json_dumps(body)
             )
             
-            response_body = json.loads(response['body'].read())
+            response_body = json_loads(response['body'].read())
             
             if "claude-3" in model_id:
                 result_text = response_body['content'][0]['text']
             else:
                 result_text = response_body.get('completion', 'Unknown response format')
             
-            logger.info(f"✅ Claude 모델 연결 성공! 응답: {result_text[:50]}...")
+            logger.info("✅ Claude 모델 연결 성공! 응답: %s...", result_text[:50])
             
             return {
                 'success': True,
@@ -174,7 +218,7 @@ class NewsProcessor:
             }
             
         except Exception as e:
-            logger.error(f"❌ Claude 모델 연결 실패: {e}")
+            logger.error("❌ Claude 모델 연결 실패: %s", e)
             return {
                 'success': False,
                 'error': str(e),
@@ -184,12 +228,13 @@ class NewsProcessor:
 
     def enhance_query_with_date(self, user_input):
         """1단계: 날짜 정의 및 질문 보강"""
+        # 오늘 날짜 정의 (요청당 한 번만 계산하여 오류 경로에서도 재사용)
+        today = datetime.now().strftime("%Y년 %m월 %d일")
+        
         try:
-            # 오늘 날짜 정의
-            today = datetime.now().strftime("%Y년 %m월 %d일")
-            
             # 날짜 처리기 초기화 (지연 로딩)
             if not self.date_processor:
+                from date_processor import DateIntelligenceProcessor
                 self.date_processor = DateIntelligenceProcessor()
             
             # 자연어 날짜 표현 처리
@@ -198,13 +243,12 @@ class NewsProcessor:
             # 질문 보강 (오늘 날짜 추가)
             enhanced_query = f"오늘은 {today}입니다. {user_input}"
             
-            logger.info(f"📅 날짜 보강 완료: {enhanced_query}")
+            logger.info("📅 날짜 보강 완료: %s", enhanced_query)
             return enhanced_query
             
         except Exception as e:
-            logger.error(f"❌ 날짜 처리 오류: {e}")
+            logger.error("❌ 날짜 처리 오류: %s", e)
             # 기본 날짜 보강
-            today = datetime.now().strftime("%Y년 %m월 %d일")
             return f"오늘은 {today}입니다. {user_input}"
 
     def search_knowledge_base(self, enhanced_query):
@@ -214,7 +258,12 @@ class NewsProcessor:
                 logger.warning("Knowledge Base ID가 설정되지 않았습니다.")
                 return "내부 지식 베이스를 사용할 수 없습니다."
             
-            logger.info(f"🔍 Knowledge Base 검색 시작: {enhanced_query[:100]}...")
+            cached_knowledge = _kb_cache.get(enhanced_query)
+            if cached_knowledge is not None:
+                logger.info("⚡ Knowledge Base 캐시 적중")
+                return cached_knowledge
+            
+            logger.info("🔍 Knowledge Base 검색 시작: %s...", enhanced_query[:100])
             
             # Bedrock Knowledge Base 검색 (최신순 정렬)
             response = bedrock_agent_runtime.retrieve(
@@ -233,26 +282,27 @@ class NewsProcessor:
                 logger.warning("Knowledge Base에서 관련 자료를 찾을 수 없습니다.")
                 return "관련 뉴스 자료를 찾을 수 없습니다."
             
-            # 결과를 발행일 기준으로 최신순 정렬
-            sorted_results = sorted(results, 
-                key=lambda x: x.get('metadata', {}).get('publish_date', ''), 
-                reverse=True
+            # 발행일 기준 최신순 상위 10건만 선택 (전체 정렬 없이 부분 선택)
+            top_results = heapq.nlargest(10, results,
+                key=lambda x: x.get('metadata', {}).get('publish_date', '')
             )
             
             # 상위 결과들 결합
-            knowledge_text = ""
-            for idx, result in enumerate(sorted_results[:10], 1):
+            knowledge_parts = []
+            for idx, result in enumerate(top_results, 1):
                 content = result.get('content', {}).get('text', '')
                 metadata = result.get('metadata', {})
                 publish_date = metadata.get('publish_date', 'Unknown')
-                
-                knowledge_text += f"\n[자료 {idx}] ({publish_date})\n{content}\n"
-            
-            logger.info(f"✅ Knowledge Base 검색 완료: {len(sorted_results)}건")
+
+                knowledge_parts.append(f"\n[자료 {idx}] ({publish_date})\n{content}\n")
+            knowledge_text = "".join(knowledge_parts)
+            _kb_cache.set(enhanced_query, knowledge_text)
+
+            logger.info("✅ Knowledge Base 검색 완료: %s건", len(results))
             return knowledge_text
             
         except Exception as e:
-            logger.error(f"❌ Knowledge Base 검색 오류: {e}")
+            logger.error("❌ Knowledge Base 검색 오류: %s", e)
             return "내부 지식 검색 중 오류가 발생했습니다."
 
     def should_use_external_search(self, knowledge_context, user_input):
@@ -262,79 +312,101 @@ class NewsProcessor:
             if len(knowledge_context) < 200:
                 return True
             
-            # 최신 정보가 필요한 키워드들
-            recent_keywords = ['실시간', '현재', '오늘', '최신', '방금', '지금']
-            if any(keyword in user_input for keyword in recent_keywords):
-                return True
-            
-            # 특정 업종/테마 관련
-            specific_keywords = ['주가', '실적', '정책', '규제', '발표', '뉴스']
-            if any(keyword in user_input for keyword in specific_keywords):
-                return True
-                
-            return False
+            # 최신 정보 또는 특정 업종/테마 관련 키워드 (단일 스캔)
+            return self.has_external_search_keywords(user_input)
             
         except Exception as e:
-            logger.error(f"외부 검색 판단 오류: {e}")
+            logger.error("외부 검색 판단 오류: %s", e)
             return False
 
+    def has_external_search_keywords(self, user_input):
+        """질문 키워드만으로 외부 검색이 필요한지 확인 (내부 검색 결과와 무관)"""
+        return _EXTERNAL_SEARCH_KEYWORD_PATTERN.search(user_input) is not None
+
+    def collect_knowledge_context(self, enhanced_query, user_input, status_func=None,
+                                  external_header="=== 외부 참조 자료 ==="):
+        """
+        2-3단계: 내부 지식 검색 + 필요 시 외부 검색 결과 결합
+        - 키워드만으로 외부 검색이 확정되면 두 검색을 동시에 실행해 대기 시간을 max(내부, 외부)로 줄임
+        - 검색을 먼저 시작한 뒤 상태 알림을 보내므로 알림 전송 시간도 검색 대기와 겹침
+        status_func(status): status는 'searching' 또는 'external_searching'
+        반환: (결합된 컨텍스트, 외부 검색 사용 여부) - 외부 검색 결과가 섞인 답변은 캐시하지 않음
+        """
+        knowledge_future = _search_executor.submit(self.search_knowledge_base, enhanced_query)
+        external_future = None
+        if self.has_external_search_keywords(user_input):
+            external_future = _search_executor.submit(self.search_external_knowledge, enhanced_query)
+        
+        if status_func:
+            status_func('searching')
+            if external_future is not None:
+                status_func('external_searching')
+        
+        knowledge_context = knowledge_future.result()
+        
+        if external_future is not None:
+            external_context = external_future.result()
+        elif self.should_use_external_search(knowledge_context, user_input):
+            # 내부 검색 결과가 부족한 경우에만 외부 검색 (순차 실행)
+            if status_func:
+                status_func('external_searching')
+            external_context = self.search_external_knowledge(enhanced_query)
+        else:
+            return knowledge_context, False
+        
+        return f"{knowledge_context}\n\n{external_header}\n{external_context}", True
+
     def search_external_knowledge(self, enhanced_query):
         """3단계: Perplexity API로 외부 지식 보강"""
         try:
-            logger.info(f"🌍 외부 검색 시작: {enhanced_query[:100]}...")
+            logger.info("🌍 외부 검색 시작: %s...", enhanced_query[:100])
             
             # Perplexity 검색기 초기화 (지연 로딩)
             if not self.perplexity_searcher:
+                from perplexity_integration import PerplexitySearchAgent
                 self.perplexity_searcher = PerplexitySearchAgent()
             
             # 검색 실행
             search_result = self.perplexity_searcher.search_external_knowledge(enhanced_query, {})
             
-            if search_result and hasattr(search_result, 'content') and search_result.content:
-                logger.info(f"✅ 외부 검색 완료: {len(search_result.content)}자")
-                return search_result.content
+            content = getattr(search_result, 'content', None)
+            if content:
+                logger.info("✅ 외부 검색 완료: %s자", len(content))
+                return content
             else:
                 logger.warning("외부 검색에서 결과를 찾을 수 없습니다.")
                 return "외부 검색에서 추가 정보를 찾을 수 없습니다."
                 
         except Exception as e:
-            logger.error(f"❌ 외부 검색 오류: {e}")
+            logger.error("❌ 외부 검색 오류: %s", e)
             return "외부 검색 중 오류가 발생했습니다."
 
+    def wait_for_background_writes(self):
+        """외부 검색 캐시 저장 등 백그라운드 쓰기 완료 대기 (Lambda 동결 전, 핸들러 반환 직전에 호출)"""
+        if self.perplexity_searcher:
+            self.perplexity_searcher.wait_for_pending_writes()
+
     def build_final_prompt(self, user_input, chat_history, knowledge_context):
         """4단계: 내부 프롬프트로 출력구조 파악 및 최종 프롬프트 구성"""
         
-        # 내부 프롬프트 - 서울경제신문 AI 요약 시스템 전용
-        system_prompt = """당신은 서울경제신문의 전문 AI 기자입니다. 
-사용자의 질문에 대해 제공된 뉴스 자료를 바탕으로 정확하고 신뢰성 있는 답변을 제공하세요.
-
-답변 구조:
-1. 핵심 요약 (2-3문장)
-2. 상세 분석 (관련 데이터 및 맥락 포함)
-3. 시장/사회적 영향
-4. 전망 및 의견
-
-답변 원칙:
-- 제공된 뉴스 자료를 기반으로 작성
-- 정확한 수치와 날짜 인용
-- 균형잡힌 시각으로 분석
-- 전문적이면서도 이해하기 쉬운 설명
-- 불확실한 정보는 명시
-"""
-
         # 대화 히스토리 처리
-        history_text = ""
+        history_buffer = io.StringIO()
         if chat_history:
             for msg in chat_history[-3:]:  # 최근 3개 대화만
                 role = msg.get('role', '')
                 content = msg.get('content', '')
                 if role == 'user':
-                    history_text += f"사용자: {content}\n"
+                    history_buffer.write("사용자: ")
+                    history_buffer.write(content)
+                    history_buffer.write("\n")
                 elif role == 'assistant':
-                    history_text += f"AI: {content[:200]}...\n"
+                    history_buffer.write("AI: ")
+                    history_buffer.write(content[:200])
+                    history_buffer.write("...\n")
+        history_text = history_buffer.getvalue()
         
         # 최종 프롬프트 구성
-        final_prompt = f"""{system_prompt}
+        final_prompt = f"""{SYSTEM_PROMPT}
 
 === 대화 맥락 ===
 {history_text}
@@ -355,7 +427,7 @@ class NewsProcessor:
         """5단계: AWS Bedrock으로 최종 생성"""
         try:
             model_id = self.get_model_id(model_tier)
-            logger.info(f"🤖 Bedrock 생성 시작: {model_id}")
+            logger.info("🤖 Bedrock 생성 시작: %s", model_id)
             
             # Claude 3 시리즈 요청 형식
             if "claude-3" in model_id:
@@ -382,186 +454,99 @@ class NewsProcessor:
             
             response = bedrock_runtime.invoke_model(
                 modelId=model_id,
-                body=json.dumps(body)
+                body=json_dumps(body)
             )
             
-            response_body = json.loads(response['body'].read())
+            response_body = json_loads(response['body'].read())
             
             if "claude-3" in model_id:
                 generated_text = response_body['content'][0]['text']
             else:
                 generated_text = response_body.get('completion', 'Generation failed')
             
-            logger.info(f"✅ Bedrock 생성 완료: {len(generated_text)}자")
+            logger.info("✅ Bedrock 생성 완료: %s자", len(generated_text))
             return generated_text
             
         except Exception as e:
-            logger.error(f"❌ Bedrock 생성 오류: {e}")
-            return f"죄송합니다. 답변 생성 중 오류가 발생했습니다: {str(e)}"
+            logger.error("❌ Bedrock 생성 오류: %s", e)
+            return f"{GENERATION_ERROR_PREFIX}: {str(e)}"
 
-    def stream_bedrock_response(self, connection_id, prompt, model_tier="claude-3.5-sonnet", send_message_func=None):
-        """스트리밍 생성 (WebSocket용)"""
-        try:
-            model_id = self.get_model_id(model_tier)
-            logger.info(f"🔄 스트리밍 생성 시작: {model_id}")
-            
-            if "claude-3" in model_id:
-                body = {
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": 4000,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.3,
-                    "top_p": 0.9
-                }
-            else:
-                body = {
-                    "prompt": f"\n\nHuman: {prompt}\n\nAssistant:",
-                    "max_tokens_to_sample": 4000,
-                    "temperature": 0.3,
-                    "top_p": 0.9
-                }
-            
-            response = bedrock_runtime.invoke_model_with_response_stream(
-                modelId=model_id,
-                body=json.dumps(body)
-            )
-            
-            # 스트리밍 처리
-            full_response = ""
-            for event in response['body']:
-                chunk = json.loads(event['chunk']['bytes'])
-                
-                if "claude-3" in model_id:
-                    if chunk.get('type') == 'content_block_delta':
-                        delta_text = chunk.get('delta', {}).get('text', '')
-                        if delta_text:
-                            full_response += delta_text
-                            if send_message_func:
-                                send_message_func(connection_id, {
-                                    'type': 'chunk',
-                                    'content': delta_text
-                                })
-                else:
-                    # 다른 모델 처리
-                    if 'completion' in chunk:
-                        delta_text = chunk['completion']
-                        full_response += delta_text
-                        if send_message_func:
-                            send_message_func(connection_id, {
-                                'type': 'chunk', 
-                                'content': delta_text
-                            })
-            
-            # 완료 메시지
-            if send_message_func:
-                send_message_func(connection_id, {
-                    'type': 'complete',
-                    'full_response': full_response
-                })
-            
-            logger.info(f"✅ 스트리밍 생성 완료: {len(full_response)}자")
-            return full_response
-            
-        except Exception as e:
-            logger.error(f"❌ 스트리밍 생성 오류: {e}")
-            if send_message_func:
-                send_message_func(connection_id, {
-                    'type': 'error',
-                    'message': f"스트리밍 중 오류: {str(e)}"
-                })
-            return f"스트리밍 중 오류가 발생했습니다: {str(e)}"
+    def get_date_meta_answer(self, user_input):
+        """날짜/시간 메타 질문이면 시스템 시각 기반 답변, 아니면 None (검색/생성 전에 호출)"""
+        if not is_date_meta_question(user_input):
+            return None
+        logger.info("🕐 날짜 메타 질문 - 시스템 응답")
+        return generate_date_meta_response(user_input)['result']['answer']
+
+    def build_response_cache_key(self, user_input, chat_history, model_tier):
+        """응답 캐시 키: (정규화된 질문, 오늘 날짜(KST), 모델, 프롬프트에 쓰이는 최근 대화)"""
+        recent_history = tuple(
+            (msg.get('role', ''), msg.get('content', '')) for msg in (chat_history or [])[-3:]
+        )
+        return (
+            user_input.strip().lower(),
+            datetime.now(KST).strftime("%Y-%m-%d"),
+            model_tier,
+            recent_history
+        )
+
+    def is_realtime_cache_key(self, cache_key):
+        """최신 정보 요청(실시간/현재/오늘 등) 질문인지 - 캐시 키의 정규화된 질문으로 판단"""
+        return _RECENT_KEYWORD_PATTERN.search(cache_key[0]) is not None
+
+    def get_cached_response(self, cache_key):
+        """응답 캐시 조회 (없거나 만료되었거나 최신 정보 요청 질문이면 None)"""
+        if self.is_realtime_cache_key(cache_key):
+            return None
+        return _response_cache.get(cache_key)
+
+    def cache_response(self, cache_key, response_content, used_external_search=False):
+        """정상 생성된 응답만 캐시에 저장 (최신 정보 요청 질문, 외부 검색 결과 기반 답변 제외)"""
+        if used_external_search or self.is_realtime_cache_key(cache_key):
+            return
+        if response_content and not response_content.startswith(GENERATION_ERROR_PREFIX):
+            _response_cache.set(cache_key, response_content)
 
     def process_complete_flow(self, user_input, chat_history=[], model_tier="claude-3.5-sonnet"):
-        """전체 7단계 플로우 처리 (REST API용)"""
+        """전체 7단계 플로우 처리 (REST API용) - {'success', 'response'} 또는 {'success', 'error'} 반환"""
         try:
             logger.info("🚀 전체 플로우 시작")
             
+            # 날짜/시간 메타 질문은 검색/생성 없이 즉시 응답
+            date_meta_answer = self.get_date_meta_answer(user_input)
+            if date_meta_answer is not None:
+                return {'success': True, 'response': date_meta_answer}
+            
+            # 동일 질문 캐시 확인
+            cache_key = self.build_response_cache_key(user_input, chat_history, model_tier)
+            cached_response = self.get_cached_response(cache_key)
+            if cached_response is not None:
+                logger.info("⚡ 응답 캐시 적중")
+                return {'success': True, 'response': cached_response}
+            
             # 1-2단계: 날짜 보강
             enhanced_query = self.enhance_query_with_date(user_input)
             
-            # 3-4단계: 내부 지식 검색
-            knowledge_context = self.search_knowledge_base(enhanced_query)
-            
-            # 5단계: 외부 검색 필요성 판단 및 실행
-            if self.should_use_external_search(knowledge_context, user_input):
-                external_context = self.search_external_knowledge(enhanced_query)
-                knowledge_context += f"\n\n=== 외부 참조 자료 ===\n{external_context}"
+            # 3-5단계: 내부 지식 검색 + 외부 검색 필요성 판단 및 실행
+            knowledge_context, used_external_search = self.collect_knowledge_context(enhanced_query, user_input)
             
             # 6단계: 최종 프롬프트 구성
             final_prompt = self.build_final_prompt(user_input, chat_history, knowledge_context)
             
             # 7단계: Bedrock 생성
             response_content = self.generate_with_bedrock(final_prompt, model_tier)
+            if response_content.startswith(GENERATION_ERROR_PREFIX):
+                return {'success': False, 'error': response_content}
+            
+            self.cache_response(cache_key, response_content, used_external_search)
             
             logger.info("✅ 전체 플로우 완료")
-            return response_content
+            return {'success': True, 'response': response_content}
             
         except Exception as e:
-            logger.error(f"❌ 전체 플로우 처리 오류: {e}")
+            logger.error("❌ 전체 플로우 처리 오류: %s", e)
             traceback.print_exc()
-            return f"처리 중 오류가 발생했습니다: {str(e)}"
-
-    def process_streaming_flow(self, connection_id, user_input, chat_history=[], model_tier="claude-3.5-sonnet", send_message_func=None):
-        """전체 7단계 플로우 처리 (WebSocket 스트리밍용)"""
-        try:
-            logger.info("🔄 스트리밍 플로우 시작")
-            
-            # 상태 메시지 전송
-            if send_message_func:
-                send_message_func(connection_id, {
-                    'type': 'status',
-                    'message': '📅 날짜 정보 처리 중...'
-                })
-            
-            # 1-2단계: 날짜 보강
-            enhanced_query = self.enhance_query_with_date(user_input)
-            
-            if send_message_func:
-                send_message_func(connection_id, {
-                    'type': 'status',
-                    'message': '🔍 내부 자료 검색 중...'
-                })
-            
-            # 3-4단계: 내부 지식 검색
-            knowledge_context = self.search_knowledge_base(enhanced_query)
-            
-            # 5단계: 외부 검색
-            if self.should_use_external_search(knowledge_context, user_input):
-                if send_message_func:
-                    send_message_func(connection_id, {
-                        'type': 'status',
-                        'message': '🌍 외부 자료 검색 중...'
-                    })
-                
-                external_context = self.search_external_knowledge(enhanced_query)
-                knowledge_context += f"\n\n=== 외부 참조 자료 ===\n{external_context}"
-            
-            if send_message_func:
-                send_message_func(connection_id, {
-                    'type': 'status',
-                    'message': '📝 답변 생성 중...'
-                })
-            
-            # 6단계: 최종 프롬프트 구성
-            final_prompt = self.build_final_prompt(user_input, chat_history, knowledge_context)
-            
-            # 7단계: 스트리밍 생성
-            self.stream_bedrock_response(connection_id, final_prompt, model_tier, send_message_func)
-            
-            logger.info("✅ 스트리밍 플로우 완료")
-            
-        except Exception as e:
-            logger.error(f"❌ 스트리밍 플로우 처리 오류: {e}")
-            if send_message_func:
-                send_message_func(connection_id, {
-                    'type': 'error',
-                    'message': f"처리 중 오류: {str(e)}"
-                })
+            return {'success': False, 'error': str(e)}
 
 # 싱글톤 패턴으로 인스턴스 관리
 _news_processor_instance = None
@@ -4,8 +4,6 @@
 """
 
 import json
-import boto3
-import os
 import logging
 import traceback
 from datetime import datetime
@@ -16,23 +14,27 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 sys.path.append(str(Path(__file__).parent.parent / 'utils'))
 
-try:
-    from core_processor import get_news_processor
-    from common_utils import DecimalEncoder
-except ImportError as e:
-    logger.error(f"모듈 import 오류: {e}")
-
 # 로깅 설정
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+from core_processor import get_news_processor, bedrock_runtime
+from common_utils import json_dumps, json_loads
+
+# 검색 단계별 SSE 상태 메시지
+SEARCH_STATUS_MESSAGES = {
+    'searching': '관련 뉴스를 검색하고 있습니다.',
+    'external_searching': '최신 정보를 추가로 검색하고 있습니다.'
+}
+
 # 환경 변수 - CDK 스택의 실제 값들 사용
 MODEL_ID = "apac.anthropic.claude-3-sonnet-20240229-v1:0"  # CDK 기본값과 동일
 
 def lambda_handler(event, context):
     """메인 Lambda 핸들러 - REST API 방식"""
     try:
-        logger.info(f"📝 REST API 요청 시작: {json.dumps(event, ensure_ascii=False)[:200]}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("📝 REST API 요청 시작: %s", json_dumps(event)[:200])
         
         # 요청 파싱
         http_method = event.get("httpMethod", "POST")
@@ -42,14 +44,14 @@ def lambda_handler(event, context):
         body = {}
         if http_method == 'POST':
             try:
-                body = json.loads(event.get('body', '{}'))
+                body = json_loads(event.get('body', '{}'))
             except json.JSONDecodeError:
                 return _create_error_response(400, "잘못된 JSON 형식입니다.")
         else:
             body = event.get('queryStringParameters') or {}
         
         user_input = body.get('userInput', '').strip()
-                chat_history = body.get('chat_history', [])
+        chat_history = body.get('chat_history', [])
         model_id = body.get('modelId', MODEL_ID)
         
         if not user_input:
@@ -59,20 +61,25 @@ def lambda_handler(event, context):
         news_processor = get_news_processor()
         
         # 스트리밍 vs 일반 응답 분기
-        if "/stream" in path:
-            return _handle_streaming_generation(news_processor, user_input, chat_history, model_id)
-        else:
-            return _handle_standard_generation(news_processor, user_input, chat_history, model_id)
+        try:
+            if "/stream" in path:
+                return _handle_streaming_generation(news_processor, user_input, chat_history, model_id)
+            else:
+                return _handle_standard_generation(news_processor, user_input, chat_history, model_id)
+        finally:
+            # Lambda 동결 전에 백그라운드 캐시 저장 완료 대기
+            news_processor.wait_for_background_writes()
 
     except Exception as e:
-        logger.error(f"❌ Handler 오류: {str(e)}")
-        logger.error(f"❌ Traceback: {traceback.format_exc()}")
+        logger.error("❌ Handler 오류: %s", e)
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error("❌ Traceback: %s", traceback.format_exc())
         return _create_error_response(500, f"서버 내부 오류: {e}")
 
 def _handle_standard_generation(news_processor, user_input, chat_history, model_id):
     """일반 생성 처리 - 공통 로직 활용"""
     try:
-        logger.info(f"📝 일반 생성 시작: {user_input[:50]}...")
+        logger.info("📝 일반 생성 시작: %s...", user_input[:50])
         
         # 공통 처리 엔진으로 전체 플로우 실행
         result = news_processor.process_complete_flow(user_input, chat_history, model_id)
@@ -83,49 +90,53 @@ def _handle_standard_generation(news_processor, user_input, chat_history, model_
         return {
             'statusCode': 200,
             'headers': _get_cors_headers(),
-            'body': json.dumps({
+            'body': json_dumps({
                 'success': True,
                 'response': result['response'],
                 'model': model_id,
                 'timestamp': datetime.now().isoformat()
-            }, ensure_ascii=False, cls=DecimalEncoder)
+            })
         }
                 
     except Exception as e:
-        logger.error(f"❌ 생성 오류: {str(e)}")
+        logger.error("❌ 생성 오류: %s", e)
         return _create_error_response(500, f"생성 중 오류가 발생했습니다: {e}")
 
 def _handle_streaming_generation(news_processor, user_input, chat_history, model_id):
     """스트리밍 생성 처리 - SSE 방식으로 REST에서도 스트리밍 지원"""
     try:
-        logger.info(f"🌊 REST 스트리밍 생성 시작: {user_input[:50]}...")
+        logger.info("🌊 REST 스트리밍 생성 시작: %s...", user_input[:50])
+        
+        # 날짜/시간 메타 질문은 검색/생성 없이 답변 이벤트 하나로 즉시 응답
+        date_meta_answer = news_processor.get_date_meta_answer(user_input)
+        if date_meta_answer is not None:
+            return _create_sse_response([
+                _format_sse_event({'text': date_meta_answer}),
+                _format_sse_event({'status': 'completed', 'message': '답변 생성이 완료되었습니다.'}),
+                "data: [DONE]\n\n"
+            ])
         
         # 1단계: 날짜 정의 및 질문 보강
         enhanced_query = news_processor.enhance_query_with_date(user_input)
-        streaming_body = f"data: {json.dumps({'status': 'processing', 'message': '질문을 분석했습니다.'}, ensure_ascii=False)}\n\n"
-        
-        # 2단계: AWS 내부 지식 검색
-        streaming_body += f"data: {json.dumps({'status': 'searching', 'message': '관련 뉴스를 검색하고 있습니다.'}, ensure_ascii=False)}\n\n"
-        knowledge_context = news_processor.search_knowledge_base(enhanced_query)
-        
-        # 3단계: 필요시 외부 검색
-        if news_processor.should_use_external_search(knowledge_context, user_input):
-            streaming_body += f"data: {json.dumps({'status': 'external_searching', 'message': '최신 정보를 추가로 검색하고 있습니다.'}, ensure_ascii=False)}\n\n"
-            external_context = news_processor.search_external_knowledge(enhanced_query)
-            knowledge_context += f"\n\n[외부 검색 결과]\n{external_context}"
+        sse_events = [_format_sse_event({'status': 'processing', 'message': '질문을 분석했습니다.'})]
+        
+        # 2-3단계: AWS 내부 지식 검색 + 필요시 외부 검색 (외부 검색 키워드가 있으면 동시 실행)
+        knowledge_context, _ = news_processor.collect_knowledge_context(
+            enhanced_query,
+            user_input,
+            status_func=lambda status: sse_events.append(
+                _format_sse_event({'status': status, 'message': SEARCH_STATUS_MESSAGES[status]})
+            ),
+            external_header="[외부 검색 결과]"
+        )
         
         # 4단계: 최종 프롬프트 구성
         final_prompt = news_processor.build_final_prompt(user_input, chat_history, knowledge_context)
         
         # 5단계: 스트리밍 생성
-        streaming_body += f"data: {json.dumps({'status': 'generating', 'message': '답변을 생성하고 있습니다.'}, ensure_ascii=False)}\n\n"
-        
-        # Bedrock 스트리밍 생성
-        bedrock_runtime = boto3.client(
-            service_name='bedrock-runtime',
-            region_name=os.environ.get('AWS_REGION', 'ap-northeast-2')  # 서울리전으로 변경
-        )
+        sse_events.append(_format_sse_event({'status': 'generating', 'message': '답변을 생성하고 있습니다.'}))
         
+        # Bedrock 스트리밍 생성 (core_processor의 모듈 단위 클라이언트 재사용)
         request_body = {
             "anthropic_version": "bedrock-2023-05-31",
             "max_tokens": 4000,
@@ -138,47 +149,54 @@ def _handle_streaming_generation(news_processor, user_input, chat_history, model
             modelId=model_id,
             contentType='application/json',
             accept='application/json',
-            body=json.dumps(request_body)
+            body=json_dumps(request_body)
         )
         
         # SSE 형식으로 스트리밍 응답 구성
         for event in response['body']:
-            chunk = json.loads(event['chunk']['bytes'])
+            chunk = json_loads(event['chunk']['bytes'])
             if chunk['type'] == 'content_block_delta':
                 text = chunk['delta'].get('text', '')
                 if text:
-                    sse_chunk = f"data: {json.dumps({'text': text}, ensure_ascii=False)}\n\n"
-                    streaming_body += sse_chunk
+                    sse_events.append(_format_sse_event({'text': text}))
         
         # 완료 메시지
-        streaming_body += f"data: {json.dumps({'status': 'completed', 'message': '답변 생성이 완료되었습니다.'}, ensure_ascii=False)}\n\n"
-        streaming_body += "data: [DONE]\n\n"
+        sse_events.append(_format_sse_event({'status': 'completed', 'message': '답변 생성이 완료되었습니다.'}))
+        sse_events.append("data: [DONE]\n\n")
         
-        return {
-            'statusCode': 200,
-            'headers': {
-                **_get_cors_headers(),
-                'Content-Type': 'text/event-stream',
-                'Cache-Control': 'no-cache',
-                'Connection': 'keep-alive'
-            },
-            'body': streaming_body
-        }
+        return _create_sse_response(sse_events)
         
     except Exception as e:
-        logger.error(f"❌ 스트리밍 오류: {str(e)}")
+        logger.error("❌ 스트리밍 오류: %s", e)
         return _create_error_response(500, f"스트리밍 중 오류가 발생했습니다: {e}")
 
+def _create_sse_response(sse_events):
+    """SSE 이벤트 목록을 text/event-stream 응답으로 변환"""
+    return {
+        'statusCode': 200,
+        'headers': {
+            **_get_cors_headers(),
+            'Content-Type': 'text/event-stream',
+            'Cache-Control': 'no-cache',
+            'Connection': 'keep-alive'
+        },
+        'body': "".join(sse_events)
+    }
+
+def _format_sse_event(payload):
+    """SSE 이벤트 한 건을 문자열로 변환"""
+    return f"data: {json_dumps(payload)}\n\n"
+
 def _create_error_response(status_code, message):
     """에러 응답 생성"""
     return {
         'statusCode': status_code,
         'headers': _get_cors_headers(),
-        'body': json.dumps({
+        'body': json_dumps({
             'success': False,
             'error': message,
             'timestamp': datetime.now().isoformat()
-        }, ensure_ascii=False)
+        })
     }
 
 def _get_cors_headers():
@@ -188,4 +206,4 @@ def _get_cors_headers():
         'Access-Control-Allow-Origin': '*',
         'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
         'Access-Control-Allow-Headers': 'Content-Type, Authorization, X-Requested-With',
-        } 
\ No newline at end of file
+    }
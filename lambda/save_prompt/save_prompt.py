@@ -1,7 +1,12 @@
 import json
+
+# 응답 본문이 고정값이므로 import 시 한 번만 직렬화
+_RESPONSE_BODY = json.dumps({"success": True, "message": "프롬프트 처리 완료"}, ensure_ascii=False)
+_RESPONSE_HEADERS = {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"}
+
 def handler(event, context):
     return {
         "statusCode": 200,
-        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
-        "body": json.dumps({"success": True, "message": "프롬프트 처리 완료"}, ensure_ascii=False)
+        "headers": dict(_RESPONSE_HEADERS),
+        "body": _RESPONSE_BODY
     }
@@ -8,22 +8,57 @@ APAC Claude 모델 중앙 관리자
 
 import os
 import logging
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-@dataclass
+# 작업 유형별 (모델 티어, 선택 사유) - 호출마다 재생성하지 않도록 모듈 상수로 유지
+TASK_MODEL_MAPPINGS = {
+    "synthesis": ("balanced", "균형잡힌 답변 생성"),
+    "analysis": ("advanced", "심층 분석 필요"),
+    "planning": ("fast", "빠른 계획 수립"),
+    "search": ("fast", "빠른 검색 결과 처리"),
+    "classification": ("fast", "빠른 분류"),
+    "expert_analysis": ("premium", "전문적 분석"),
+    "creative": ("high_performance", "창의적 작업"),
+    "latest_features": ("latest", "최신 기능 활용")
+}
+DEFAULT_TASK_MAPPING = ("balanced", "기본 작업")
+
+# 복잡도별 후보 모델 티어
+COMPLEXITY_CANDIDATES = {
+    "low": ("fast", "balanced"),
+    "medium": ("balanced", "high_performance", "fast"),
+    "high": ("advanced", "high_performance", "premium"),
+    "expert": ("premium", "latest", "advanced")
+}
+DEFAULT_COMPLEXITY_CANDIDATES = ("balanced",)
+BUDGET_TIERS = ("economy", "standard", "premium")
+
+@lru_cache(maxsize=1)
+def _load_environment_config() -> Mapping[str, object]:
+    """환경변수 기반 모델 설정 (Lambda 컨테이너 수명 동안 불변이므로 한 번만 파싱)"""
+    return MappingProxyType({
+        "synthesizer_tier": os.environ.get("SYNTHESIZER_MODEL_TIER", "fast"),
+        "react_tier": os.environ.get("REACT_MODEL_TIER", "fast"),
+        "priority": os.environ.get("SYNTHESIS_PRIORITY", "balance"),
+        "apac_enabled": os.environ.get("APAC_MODELS_ENABLED", "true").lower() == "true"
+    })
+
+@dataclass(frozen=True, slots=True)
 class ModelInfo:
-    """APAC 모델 정보"""
+    """APAC 모델 정보 (불변)"""
     model_id: str
     name: str
     avg_response_time: float
     cost_per_1k_tokens: float
     max_tokens: int
-    specialties: List[str]
+    specialties: Tuple[str, ...]
     recommended_use: str
 
 class APACModelManager:
@@ -36,14 +71,14 @@ class APACModelManager:
         """APAC 모델 관리자 초기화"""
         
         # 실제 테스트된 APAC 모델 정보 (서울 리전 기준)
-        self.models = {
+        self.models = MappingProxyType({
             "fast": ModelInfo(
                 model_id="apac.anthropic.claude-3-haiku-20240307-v1:0",
                 name="Claude 3 Haiku (APAC)",
                 avg_response_time=1.89,
                 cost_per_1k_tokens=0.25,
                 max_tokens=200000,
-                specialties=["빠른_응답", "간단_질문", "실시간_처리"],
+                specialties=("빠른_응답", "간단_질문", "실시간_처리"),
                 recommended_use="간단한 질문, 빠른 응답 필요시"
             ),
             "balanced": ModelInfo(
@@ -52,7 +87,7 @@ class APACModelManager:
                 avg_response_time=3.22,
                 cost_per_1k_tokens=3.0,
                 max_tokens=200000,
-                specialties=["균형", "일반_질문", "안정성"],
+                specialties=("균형", "일반_질문", "안정성"),
                 recommended_use="일반적인 질문, 균형잡힌 성능"
             ),
             "advanced": ModelInfo(
@@ -61,7 +96,7 @@ class APACModelManager:
                 avg_response_time=4.17,
                 cost_per_1k_tokens=3.0,
                 max_tokens=200000,
-                specialties=["최신_기술", "정확성", "복잡_분석"],
+                specialties=("최신_기술", "정확성", "복잡_분석"),
                 recommended_use="복잡한 분석, 최신 기술 활용"
             ),
             "high_performance": ModelInfo(
@@ -70,7 +105,7 @@ class APACModelManager:
                 avg_response_time=3.92,
                 cost_per_1k_tokens=3.0,
                 max_tokens=200000,
-                specialties=["고성능", "창의성", "복잡_추론"],
+                specialties=("고성능", "창의성", "복잡_추론"),
                 recommended_use="고품질 답변, 창의적 작업"
             ),
             "premium": ModelInfo(
@@ -79,7 +114,7 @@ class APACModelManager:
                 avg_response_time=4.48,
                 cost_per_1k_tokens=15.0,
                 max_tokens=200000,
-                specialties=["최고_품질", "전문_분석", "정확성"],
+                specialties=("최고_품질", "전문_분석", "정확성"),
                 recommended_use="전문적 분석, 최고 품질 필요시"
             ),
             "latest": ModelInfo(
@@ -88,21 +123,47 @@ class APACModelManager:
                 avg_response_time=5.78,
                 cost_per_1k_tokens=3.0,
                 max_tokens=200000,
-                specialties=["최신_기능", "향상된_추론", "멀티모달"],
+                specialties=("최신_기능", "향상된_추론", "멀티모달"),
                 recommended_use="최신 기능 활용, 복합 작업"
             )
-        }
+        })
         
         # 성능 순위 (속도 기준)
-        self.speed_ranking = ["fast", "high_performance", "balanced", "advanced", "premium", "latest"]
+        self.speed_ranking = ("fast", "high_performance", "balanced", "advanced", "premium", "latest")
         
         # 품질 순위 (성능 기준)
-        self.quality_ranking = ["premium", "latest", "advanced", "high_performance", "balanced", "fast"]
+        self.quality_ranking = ("premium", "latest", "advanced", "high_performance", "balanced", "fast")
         
         # 비용 효율성 순위
-        self.cost_efficiency_ranking = ["fast", "balanced", "high_performance", "advanced", "latest", "premium"]
+        self.cost_efficiency_ranking = ("fast", "balanced", "high_performance", "advanced", "latest", "premium")
+        
+        # 균형 순위 (기본값)
+        self.balance_ranking = ("balanced", "high_performance", "fast", "advanced", "latest", "premium")
+        
+        # 우선순위별 순위표 (select_optimal_model 분기 대신 사전 조회)
+        self.priority_rankings = {
+            "speed": self.speed_ranking,
+            "quality": self.quality_ranking,
+            "cost": self.cost_efficiency_ranking,
+            "balance": self.balance_ranking
+        }
+        
+        # (우선순위, 복잡도, 예산) 조합별 선택 순서대로 정렬된 후보 티어 튜플 사전 계산
+        # 런타임에는 응답 시간 제한만 적용하며 첫 번째 후보를 선택
+        self._precomputed = {
+            (priority, complexity, budget_tier): self._build_selection_order(ranking, tiers, budget_tier)
+            for priority, ranking in self.priority_rankings.items()
+            for complexity, tiers in COMPLEXITY_CANDIDATES.items()
+            for budget_tier in BUDGET_TIERS
+        }
         
-        logger.info(f"🎯 APACModelManager 초기화 완료 - {len(self.models)}개 모델 관리")
+        # 사용 가능 모델 ID 집합 (O(1) 조회)
+        self._model_ids = frozenset(model.model_id for model in self.models.values())
+        
+        # 모델 비교 정보 캐시 (models는 초기화 이후 변경되지 않음)
+        self._comparison_cache = None
+        
+        logger.info("🎯 APACModelManager 초기화 완료 - %d개 모델 관리", len(self.models))
     
     def get_model_by_tier(self, tier: str) -> Optional[ModelInfo]:
         """티어별 모델 정보 반환"""
@@ -115,6 +176,17 @@ class APACModelManager:
             return model_info.model_id
         return self.models["fast"].model_id  # 기본값
     
+    @staticmethod
+    def _build_selection_order(ranking, tiers, budget_tier: str) -> Tuple[str, ...]:
+        """예산 티어 필터링을 적용한 후보 티어를 우선순위 순서로 정렬"""
+        if budget_tier == "economy":
+            candidates = [t for t in tiers if t in ("fast", "balanced")]
+        elif budget_tier == "standard":
+            candidates = [t for t in tiers if t != "premium"]
+        else:  # premium: 모든 모델 허용
+            candidates = tiers
+        return tuple(tier for tier in ranking if tier in candidates)
+    
     def select_optimal_model(self, 
                            complexity: str = "medium",
                            priority: str = "balance", 
@@ -133,50 +205,29 @@ class APACModelManager:
             (model_tier, ModelInfo)
         """
         
-        # 1. 복잡도별 후보 모델
-        complexity_candidates = {
-            "low": ["fast", "balanced"],
-            "medium": ["balanced", "high_performance", "fast"],
-            "high": ["advanced", "high_performance", "premium"],
-            "expert": ["premium", "latest", "advanced"]
-        }
+        # 1-4. 복잡도 후보 + 예산 필터링 + 우선순위 정렬 (사전 계산값 조회)
+        selection_order = self._precomputed.get((priority, complexity, budget_tier))
+        if selection_order is None:
+            # 알 수 없는 값: 우선순위는 balance, 복잡도는 기본 후보로 대체
+            selection_order = self._build_selection_order(
+                self.priority_rankings.get(priority, self.balance_ranking),
+                COMPLEXITY_CANDIDATES.get(complexity, DEFAULT_COMPLEXITY_CANDIDATES),
+                budget_tier
+            )
         
-        candidates = complexity_candidates.get(complexity, ["balanced"])
-        
-        # 2. 예산 티어별 필터링
-        if budget_tier == "economy":
-            candidates = [c for c in candidates if c in ["fast", "balanced"]]
-        elif budget_tier == "standard":
-            candidates = [c for c in candidates if c not in ["premium"]]
-        # premium: 모든 모델 허용
-        
-        # 3. 응답 시간 제한 적용
-        if max_response_time:
-            candidates = [c for c in candidates 
-                         if self.models[c].avg_response_time <= max_response_time]
-        
-        # 4. 우선순위별 정렬
-        if priority == "speed":
-            ranking = self.speed_ranking
-        elif priority == "quality":
-            ranking = self.quality_ranking
-        elif priority == "cost":
-            ranking = self.cost_efficiency_ranking
-        else:  # balance
-            ranking = ["balanced", "high_performance", "fast", "advanced", "latest", "premium"]
-        
-        # 5. 최적 모델 선택
-        for tier in ranking:
-            if tier in candidates:
-                selected_model = self.models[tier]
-                logger.info(f"🎯 모델 선택: {tier} ({selected_model.name}) - "
-                           f"복잡도={complexity}, 우선순위={priority}, 예산={budget_tier}")
-                return tier, selected_model
+        # 5. 응답 시간 제한을 만족하는 첫 번째 후보 선택
+        for tier in selection_order:
+            selected_model = self.models[tier]
+            if max_response_time and selected_model.avg_response_time > max_response_time:
+                continue
+            logger.info("🎯 모델 선택: %s (%s) - 복잡도=%s, 우선순위=%s, 예산=%s",
+                        tier, selected_model.name, complexity, priority, budget_tier)
+            return tier, selected_model
         
         # 6. 폴백: 기본 모델
         fallback_tier = "fast"
         fallback_model = self.models[fallback_tier]
-        logger.warning(f"⚠️ 조건에 맞는 모델 없음, 기본 모델 사용: {fallback_tier}")
+        logger.warning("⚠️ 조건에 맞는 모델 없음, 기본 모델 사용: %s", fallback_tier)
         return fallback_tier, fallback_model
     
     def get_model_for_task(self, task_type: str) -> Tuple[str, ModelInfo]:
@@ -187,29 +238,21 @@ class APACModelManager:
             task_type: synthesis/analysis/planning/search/classification
         """
         
-        task_mappings = {
-            "synthesis": ("balanced", "균형잡힌 답변 생성"),
-            "analysis": ("advanced", "심층 분석 필요"),
-            "planning": ("fast", "빠른 계획 수립"),
-            "search": ("fast", "빠른 검색 결과 처리"),
-            "classification": ("fast", "빠른 분류"),
-            "expert_analysis": ("premium", "전문적 분석"),
-            "creative": ("high_performance", "창의적 작업"),
-            "latest_features": ("latest", "최신 기능 활용")
-        }
-        
-        tier, reason = task_mappings.get(task_type, ("balanced", "기본 작업"))
+        tier, reason = TASK_MODEL_MAPPINGS.get(task_type, DEFAULT_TASK_MAPPING)
         model_info = self.models[tier]
         
-        logger.info(f"📋 작업별 모델 선택: {task_type} → {tier} ({reason})")
+        logger.info("📋 작업별 모델 선택: %s → %s (%s)", task_type, tier, reason)
         return tier, model_info
     
-    def get_all_models(self) -> Dict[str, ModelInfo]:
+    def get_all_models(self) -> Mapping[str, ModelInfo]:
         """모든 모델 정보 반환"""
         return self.models
     
-    def get_model_comparison(self) -> Dict[str, Dict]:
-        """모델 비교 정보 반환"""
+    def get_model_comparison(self) -> Mapping[str, Dict]:
+        """모델 비교 정보 반환 (최초 호출 시 생성 후 읽기 전용 뷰로 재사용)"""
+        if self._comparison_cache is not None:
+            return self._comparison_cache
+        
         comparison = {}
         
         for tier, model in self.models.items():
@@ -222,21 +265,16 @@ class APACModelManager:
                 "recommended_use": model.recommended_use
             }
         
-        return comparison
+        self._comparison_cache = MappingProxyType(comparison)
+        return self._comparison_cache
     
     def validate_model_availability(self, model_id: str) -> bool:
         """모델 사용 가능 여부 확인"""
-        available_models = [model.model_id for model in self.models.values()]
-        return model_id in available_models
+        return model_id in self._model_ids
     
-    def get_environment_config(self) -> Dict[str, str]:
+    def get_environment_config(self) -> Mapping[str, object]:
         """환경변수 기반 모델 설정 반환"""
-        return {
-            "synthesizer_tier": os.environ.get("SYNTHESIZER_MODEL_TIER", "fast"),
-            "react_tier": os.environ.get("REACT_MODEL_TIER", "fast"),
-            "priority": os.environ.get("SYNTHESIS_PRIORITY", "balance"),
-            "apac_enabled": os.environ.get("APAC_MODELS_ENABLED", "true").lower() == "true"
-        }
+        return _load_environment_config()
 
 # 전역 모델 매니저 인스턴스
 model_manager = APACModelManager()
@@ -1,15 +1,31 @@
 import json
 import boto3
+from botocore.config import Config
 import os
 import logging
+import time
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Hashable, Optional
 from decimal import Decimal
 
+try:
+    import orjson
+except ImportError:  # orjson이 없는 환경에서는 표준 json으로 폴백
+    orjson = None
+
 # 로깅 설정
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# 웜 컨테이너에서 재사용되는 boto3 클라이언트 공통 설정 (keep-alive 연결 풀 + 표준 재시도)
+BOTO3_CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=20,
+    retries={'mode': 'standard', 'max_attempts': 3}
+)
+
 class DecimalEncoder(json.JSONEncoder):
     """DynamoDB Decimal 타입을 JSON 직렬화 가능한 타입으로 변환하는 커스텀 인코더"""
     def default(self, obj):
@@ -20,6 +36,65 @@ class DecimalEncoder(json.JSONEncoder):
                 return float(obj)
         return super(DecimalEncoder, self).default(obj)
 
+_decimal_encoder = DecimalEncoder()
+
+# 표준 json과 허용 타입을 맞추기 위한 orjson 옵션
+# - NON_STR_KEYS: int 등 문자열이 아닌 dict 키 허용 (json.dumps처럼 문자열로 변환)
+# - PASSTHROUGH_*: datetime/dataclass를 자동 직렬화하지 않고 default로 넘김 (json.dumps처럼 TypeError)
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None else 0
+)
+
+def json_dumps(obj: Any) -> str:
+    """
+    JSON 직렬화 (orjson 우선, 없으면 json.dumps(ensure_ascii=False, cls=DecimalEncoder))
+    파싱 결과는 같지만 문자열은 다를 수 있음: orjson은 공백 없는 구분자(",", ":")를 쓰고
+    NaN/Infinity는 null로, 64비트를 넘는 정수는 TypeError로 처리
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_decimal_encoder.default, option=_ORJSON_OPTIONS).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, cls=DecimalEncoder)
+
+def json_loads(data: Any) -> Any:
+    """JSON 역직렬화 (orjson 우선, str/bytes 모두 허용)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class TTLCache:
+    """
+    웜 Lambda 컨테이너용 인메모리 TTL + LRU 캐시
+    - maxsize 초과 시 가장 오래 사용되지 않은 항목부터 제거
+    - ttl(초) 경과 항목은 조회 시 만료 처리
+    """
+    def __init__(self, maxsize: int = 256, ttl: float = 900):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """캐시 저장"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
 def get_cors_headers() -> Dict[str, str]:
     """CORS 헤더 반환"""
     return {
@@ -63,9 +138,9 @@ def load_prompt_from_s3(s3_client, bucket: str, s3_key: str) -> str:
 def get_aws_clients(region: str):
     """AWS 클라이언트들을 한번에 초기화"""
     return {
-        'dynamodb': boto3.resource('dynamodb', region_name=region),
-        's3': boto3.client('s3', region_name=region),
-        'bedrock': boto3.client('bedrock-runtime', region_name=region),
+        'dynamodb': boto3.resource('dynamodb', region_name=region, config=BOTO3_CLIENT_CONFIG),
+        's3': boto3.client('s3', region_name=region, config=BOTO3_CLIENT_CONFIG),
+        'bedrock': boto3.client('bedrock-runtime', region_name=region, config=BOTO3_CLIENT_CONFIG),
     }
 
 def validate_required_fields(data: Dict[str, Any], required_fields: list) -> tuple:
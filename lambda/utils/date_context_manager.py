@@ -5,13 +5,51 @@
 - 사용자 질문 처리 시작 시점에 현재 날짜 컨텍스트 생성
 """
 
+import re
 from datetime import datetime, timedelta
-import pytz
-from typing import Dict, Any
+from zoneinfo import ZoneInfo
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 요일 한글 변환 (datetime.weekday() 인덱스 순서) 및 공통 날짜 포맷
+WEEKDAYS_KO = ("월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일")
+DATE_FORMAT = '%Y년 %m월 %d일'
+DATETIME_FORMAT = '%Y년 %m월 %d일 %H시 %M분'
+
+# "N년 전" / "N개월 전" / "N일 전" 통합 패턴 (단위는 group(2)로 구분)
+_RELATIVE_PERIOD_PATTERN = re.compile(r'(\d+)(년|개?월|일)\s*전')
+
+# 날짜 관련 질문 판별 키워드
+DATE_KEYWORDS = (
+    "년", "월", "일", "어제", "오늘", "내일", 
+    "작년", "내년", "지난해", "올해", "최근", 
+    "전", "후", "시간", "때", "시점", "기간"
+)
+# 한 글자 키워드는 문자 집합 교집합으로, 나머지는 부분 문자열 검사로 판별
+# (한 글자 키워드를 포함하는 다중 글자 키워드는 이미 한 글자 검사에서 걸리므로 제외)
+_SINGLE_CHAR_DATE_KEYWORDS = frozenset(k for k in DATE_KEYWORDS if len(k) == 1)
+_MULTI_CHAR_DATE_KEYWORDS = tuple(
+    k for k in DATE_KEYWORDS
+    if len(k) > 1 and _SINGLE_CHAR_DATE_KEYWORDS.isdisjoint(k)
+)
+
+# 직접 매핑되는 상대적 표현
+RELATIVE_MAPPINGS = {
+    "오늘": timedelta(days=0),
+    "어제": timedelta(days=-1),
+    "내일": timedelta(days=1),
+    "일주일 전": timedelta(days=-7),
+    "일주일 후": timedelta(days=7),
+    "한달 전": timedelta(days=-30),
+    "한달 후": timedelta(days=30),
+    "작년": timedelta(days=-365),
+    "지난해": timedelta(days=-365),
+    "내년": timedelta(days=365),
+}
+
 class DateContextManager:
     """
     전체 AI 처리 과정에서 사용할 날짜 컨텍스트 관리
@@ -19,13 +57,20 @@ class DateContextManager:
     
     def __init__(self):
         # 한국 시간대
-        self.kst = pytz.timezone('Asia/Seoul')
+        self.kst = ZoneInfo('Asia/Seoul')
         self.current_time = datetime.now(self.kst)
         
-        # 날짜 컨텍스트 생성
-        self.date_context = self._create_date_context()
+        # 날짜 컨텍스트는 처음 조회할 때 생성 (지연 생성)
+        self._date_context = None
         
-        logger.info(f"📅 날짜 컨텍스트 생성됨: {self.current_time.strftime('%Y년 %m월 %d일 %H시 %M분')}")
+        logger.info(f"📅 날짜 컨텍스트 생성됨: {self.current_time.strftime(DATETIME_FORMAT)}")
+    
+    @property
+    def date_context(self) -> Mapping[str, Any]:
+        """날짜 컨텍스트 (최초 조회 시 한 번 생성, 읽기 전용 뷰로 공유)"""
+        if self._date_context is None:
+            self._date_context = MappingProxyType(self._create_date_context())
+        return self._date_context
     
     def _create_date_context(self) -> Dict[str, Any]:
         """
@@ -34,14 +79,17 @@ class DateContextManager:
         """
         current = self.current_time
         
-        # 요일 한글 변환
-        weekdays = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
+        # 검색 범위 경계 (마이크로초까지 0으로 맞춰 ISO 문자열을 결정적으로 유지)
+        today_start = current.replace(hour=0, minute=0, second=0, microsecond=0)
+        today_end = today_start.replace(hour=23, minute=59, second=59)
+        yesterday_start = today_start - timedelta(days=1)
+        yesterday_end = today_end - timedelta(days=1)
         
         context = {
             # 기본 현재 정보
             "현재_시간": current,
-            "현재_날짜_문자열": current.strftime('%Y년 %m월 %d일'),
-            "현재_요일": weekdays[current.weekday()],
+            "현재_날짜_문자열": current.strftime(DATE_FORMAT),
+            "현재_요일": WEEKDAYS_KO[current.weekday()],
             "현재_년도": current.year,
             "현재_월": current.month,
             "현재_일": current.day,
@@ -69,10 +117,10 @@ class DateContextManager:
             "ai_date_prompt": self._generate_ai_date_prompt(),
             
             # 검색용 ISO 형식
-            "오늘_시작": current.replace(hour=0, minute=0, second=0).isoformat(),
-            "오늘_끝": current.replace(hour=23, minute=59, second=59).isoformat(),
-            "어제_시작": (current - timedelta(days=1)).replace(hour=0, minute=0, second=0).isoformat(),
-            "어제_끝": (current - timedelta(days=1)).replace(hour=23, minute=59, second=59).isoformat(),
+            "오늘_시작": today_start.isoformat(),
+            "오늘_끝": today_end.isoformat(),
+            "어제_시작": yesterday_start.isoformat(),
+            "어제_끝": yesterday_end.isoformat(),
             
             # 메타 정보
             "생성_시각": current.isoformat(),
@@ -86,18 +134,18 @@ class DateContextManager:
         AI 에이전트들이 사용할 날짜 정보 프롬프트 생성
         """
         current = self.current_time
-        weekdays = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
+        yesterday = current - timedelta(days=1)
         
         prompt = f"""
 ## 📅 현재 날짜 및 시간 정보 (한국 표준시)
 
 **현재 시점:**
-- 오늘: {current.strftime('%Y년 %m월 %d일')} ({weekdays[current.weekday()]})
+- 오늘: {current.strftime(DATE_FORMAT)} ({WEEKDAYS_KO[current.weekday()]})
 - 현재 시각: {current.strftime('%H시 %M분')}
 - 현재 년도: {current.year}년
 
 **상대적 날짜 참조:**
-- 어제: {current.year}년 {current.month}월 {current.day-1}일
+- 어제: {yesterday.year}년 {yesterday.month}월 {yesterday.day}일
 - 작년/지난해: {current.year-1}년
 - 1년 전: {current.year-1}년
 - 2년 전: {current.year-2}년
@@ -108,7 +156,7 @@ class DateContextManager:
 """
         return prompt.strip()
     
-    def get_date_context(self) -> Dict[str, Any]:
+    def get_date_context(self) -> Mapping[str, Any]:
         """날짜 컨텍스트 반환"""
         return self.date_context
     
@@ -129,79 +177,30 @@ class DateContextManager:
         try:
             current = self.current_time
             
-            # 상대적 표현 매핑
-            relative_mappings = {
-                "오늘": timedelta(days=0),
-                "어제": timedelta(days=-1),
-                "내일": timedelta(days=1),
-                "일주일 전": timedelta(days=-7),
-                "일주일 후": timedelta(days=7),
-                "한달 전": timedelta(days=-30),
-                "한달 후": timedelta(days=30),
-                "작년": timedelta(days=-365),
-                "지난해": timedelta(days=-365),
-                "내년": timedelta(days=365),
-            }
-            
-            # 숫자 + 단위 패턴 처리
-            import re
-            
-            # "N년 전" 패턴
-            year_pattern = re.search(r'(\d+)년\s*전', expression)
-            if year_pattern:
-                years = int(year_pattern.group(1))
-                target_date = current.replace(year=current.year - years)
-                return {
-                    "target_date": target_date,
-                    "year": target_date.year,
-                    "date_string": target_date.strftime('%Y년 %m월 %d일'),
-                    "iso_string": target_date.isoformat(),
-                    "expression": expression
-                }
-            
-            # "N개월 전" 패턴
-            month_pattern = re.search(r'(\d+)개?월\s*전', expression)
-            if month_pattern:
-                months = int(month_pattern.group(1))
-                target_date = current - timedelta(days=months * 30)
-                return {
-                    "target_date": target_date,
-                    "year": target_date.year,
-                    "date_string": target_date.strftime('%Y년 %m월 %d일'),
-                    "iso_string": target_date.isoformat(),
-                    "expression": expression
-                }
-            
-            # "N일 전" 패턴
-            day_pattern = re.search(r'(\d+)일\s*전', expression)
-            if day_pattern:
-                days = int(day_pattern.group(1))
-                target_date = current - timedelta(days=days)
-                return {
-                    "target_date": target_date,
-                    "year": target_date.year,
-                    "date_string": target_date.strftime('%Y년 %m월 %d일'),
-                    "iso_string": target_date.isoformat(),
-                    "expression": expression
-                }
+            # 숫자 + 단위 패턴 처리 ("N년 전", "N개월 전", "N일 전")
+            period_match = _RELATIVE_PERIOD_PATTERN.search(expression)
+            if period_match:
+                amount = int(period_match.group(1))
+                unit = period_match.group(2)
+                if unit == "년":
+                    target_date = current.replace(year=current.year - amount)
+                elif unit == "일":
+                    target_date = current - timedelta(days=amount)
+                else:  # 월 / 개월
+                    target_date = current - timedelta(days=amount * 30)
+                return self._build_relative_date_result(target_date, expression)
             
             # 직접 매핑된 표현들
-            if expression in relative_mappings:
-                target_date = current + relative_mappings[expression]
-                return {
-                    "target_date": target_date,
-                    "year": target_date.year,
-                    "date_string": target_date.strftime('%Y년 %m월 %d일'),
-                    "iso_string": target_date.isoformat(),
-                    "expression": expression
-                }
+            offset = RELATIVE_MAPPINGS.get(expression)
+            if offset is not None:
+                return self._build_relative_date_result(current + offset, expression)
             
             # 매칭되지 않는 경우 현재 날짜 반환
             logger.warning(f"인식되지 않은 날짜 표현: {expression}")
             return {
                 "target_date": current,
                 "year": current.year,
-                "date_string": current.strftime('%Y년 %m월 %d일'),
+                "date_string": current.strftime(DATE_FORMAT),
                 "iso_string": current.isoformat(),
                 "expression": expression,
                 "warning": "인식되지 않은 표현"
@@ -212,32 +211,39 @@ class DateContextManager:
             return {
                 "target_date": self.current_time,
                 "year": self.current_time.year,
-                "date_string": self.current_time.strftime('%Y년 %m월 %d일'),
+                "date_string": self.current_time.strftime(DATE_FORMAT),
                 "iso_string": self.current_time.isoformat(),
                 "expression": expression,
                 "error": str(e)
             }
     
+    @staticmethod
+    def _build_relative_date_result(target_date: datetime, expression: str) -> Dict[str, Any]:
+        """계산된 날짜 정보 구성"""
+        return {
+            "target_date": target_date,
+            "year": target_date.year,
+            "date_string": target_date.strftime(DATE_FORMAT),
+            "iso_string": target_date.isoformat(),
+            "expression": expression
+        }
+    
     def is_date_related_query(self, query: str) -> bool:
         """
         질문이 날짜 관련인지 판단
         """
-        date_keywords = [
-            "년", "월", "일", "어제", "오늘", "내일", 
-            "작년", "내년", "지난해", "올해", "최근", 
-            "전", "후", "시간", "때", "시점", "기간"
-        ]
-        
         query_lower = query.lower()
-        return any(keyword in query_lower for keyword in date_keywords)
+        if not _SINGLE_CHAR_DATE_KEYWORDS.isdisjoint(query_lower):
+            return True
+        return any(keyword in query_lower for keyword in _MULTI_CHAR_DATE_KEYWORDS)
     
     def refresh_context(self):
         """
         날짜 컨텍스트 새로고침 (장시간 실행 시 사용)
         """
         self.current_time = datetime.now(self.kst)
-        self.date_context = self._create_date_context()
-        logger.info(f"📅 날짜 컨텍스트 새로고침: {self.current_time.strftime('%Y년 %m월 %d일 %H시 %M분')}")
+        self._date_context = None
+        logger.info(f"📅 날짜 컨텍스트 새로고침: {self.current_time.strftime(DATETIME_FORMAT)}")
 
 # 글로벌 인스턴스 (싱글톤 패턴)
 _date_context_manager = None
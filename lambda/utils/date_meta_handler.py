@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+날짜 메타 질문 처리 핸들러
+- "오늘의 날짜가 무엇인가요?" 같은 질문 직접 처리
+"""
+import re
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from date_context_manager import WEEKDAYS_KO, DATE_FORMAT, DATETIME_FORMAT
+
+KST = ZoneInfo('Asia/Seoul')
+
+# 질문 전체가 날짜/시간을 묻는 경우만 매칭 (공백 제거 후 fullmatch)
+# "현재 삼성전자 2024년 실적 전망"처럼 날짜 단어가 들어간 일반 뉴스 질문은 제외해야 하므로 부분 매칭을 쓰지 않음
+DATE_META_PATTERNS = [
+    r"(?:오늘|지금|현재)?의?날짜(?:가|는)?(?:뭐|무엇|며칠|몇일|어떻게돼|어떻게되나요|어떻게됩니까)?",
+    r"(?:오늘|지금|현재)?(?:은|이)?(?:몇월며칠|몇월몇일|며칠|몇일)",
+    r"(?:지금|현재)?(?:은|이)?(?:몇시|시간)(?:이|은)?(?:몇시|어떻게돼)?",
+    r"(?:오늘|지금)?(?:은|이)?무슨요일",
+    r"(?:올해|지금|현재)?(?:는|은)?(?:몇년|몇년도|무슨년도)",
+]
+
+# 허용하는 질문 어미 (예: "이야", "인가요", "알려줘")
+_DATE_META_ENDING = (
+    r"(?:이야|야|이에요|예요|에요|인가요|입니까|이니|니|이지|일까|일까요|인지|좀)?"
+    r"(?:알려줘|알려주세요|알려줄래|말해줘)?"
+)
+
+# 날짜/시간만 묻는 질문은 짧으므로 길이를 넘으면 패턴 검사 없이 일반 질문으로 처리
+_DATE_META_MAX_LENGTH = 20
+
+# 모든 패턴을 하나의 정규식으로 미리 컴파일 (질문당 한 번만 검사)
+_DATE_META_RE = re.compile(
+    "(?:" + "|".join(f"(?:{pattern})" for pattern in DATE_META_PATTERNS) + ")" + _DATE_META_ENDING
+)
+
+def _normalize_query(query: str) -> str:
+    """공백 제거 + 끝의 문장부호 제거"""
+    return query.lower().replace(" ", "").rstrip("?!.~")
+
+def is_date_meta_question(query: str) -> bool:
+    """날짜/시간 메타 정보 질문인지 판단 (질문 전체가 날짜/시간 질문일 때만 True)"""
+    query_normalized = _normalize_query(query)
+    if not query_normalized or len(query_normalized) > _DATE_META_MAX_LENGTH:
+        return False
+    return _DATE_META_RE.fullmatch(query_normalized) is not None
+
+def generate_date_meta_response(query: str) -> dict:
+    """날짜/시간 메타 정보 직접 응답 생성"""
+    current_time = datetime.now(KST)
+    current_weekday = WEEKDAYS_KO[current_time.weekday()]
+    
+    datetime_str = current_time.strftime(DATETIME_FORMAT)
+    date_str = current_time.strftime(DATE_FORMAT)
+    
+    # 질문에 따른 맞춤 답변 생성
+    query_normalized = _normalize_query(query)
+    
+    if "시간" in query_normalized or "몇시" in query_normalized:
+        answer = f"현재 시간은 {datetime_str}입니다."
+    elif "요일" in query_normalized:
+        answer = f"오늘은 {date_str} {current_weekday}입니다."
+    else:
+        answer = f"오늘 날짜는 {date_str} {current_weekday}입니다."
+    
+    return {
+        "success": True,
+        "result": {
+            "answer": answer,
+            "thinking_process": [
+                {
+                    "step": "🕐 시스템 시간 확인",
+                    "content": f"현재 시스템 시간을 확인했습니다: {current_time.isoformat()}"
+                },
+                {
+                    "step": "📅 한국 시간 변환",
+                    "content": f"한국 표준시 기준으로 {datetime_str} {current_weekday}로 확인했습니다."
+                },
+                {
+                    "step": "✅ 답변 생성",
+                    "content": "사용자 질문에 맞는 날짜/시간 정보를 제공했습니다."
+                }
+            ],
+            "metadata": {
+                "response_type": "date_meta",
+                "selected_model": "시스템 응답",
+                "complexity_level": "매우 간단",
+                "model_priority": "즉시 응답",
+                "confidence_score": 1.0
+            }
+        },
+        "routing_info": {
+            "route_type": "date_meta_response",
+            "response_method": "direct_system",
+            "processing_time": "즉시"
+        },
+        "execution_result": None,
+        "external_context": []
+    } 
\ No newline at end of file
@@ -4,9 +4,14 @@ WebSocket 연결 처리 Lambda 함수
 import json
 import os
 import boto3
+from botocore.config import Config
 from datetime import datetime, timedelta
 
-dynamodb = boto3.client('dynamodb')
+# 웜 컨테이너에서 연결 재사용 (keep-alive) + 표준 재시도
+dynamodb = boto3.client('dynamodb', config=Config(
+    tcp_keepalive=True,
+    retries={'mode': 'standard', 'max_attempts': 3}
+))
 CONNECTIONS_TABLE = os.environ.get('CONNECTIONS_TABLE')
 
 def handler(event, context):
@@ -4,11 +4,11 @@
 실시간 피드백과 상태 메시지를 통한 최적의 사용자 경험 제공
 """
 
-import json
 import boto3
 import os
 import logging
 import traceback
+import time
 from datetime import datetime
 import sys
 from pathlib import Path
@@ -17,11 +17,17 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent / 'generate'))
 sys.path.append(str(Path(__file__).parent.parent / 'utils'))
 
-try:
-    from core_processor import get_news_processor
-    from common_utils import DecimalEncoder
-except ImportError as e:
-    print(f"모듈 import 오류: {e}")
+# 모듈 수준 클라이언트 설정과 handler가 의존하므로 실패 시 바로 import 오류로 드러나도록 보호하지 않음
+from common_utils import json_dumps, json_loads, BOTO3_CLIENT_CONFIG
+
+
+def get_news_processor():
+    """
+    NewsProcessor 싱글톤 반환 - core_processor는 첫 스트림 요청 시 import
+    (날짜 처리/외부 검색 모듈까지 끌어오므로 스트림 외 이벤트의 콜드 스타트 비용에서 제외)
+    """
+    from core_processor import get_news_processor as _get_news_processor
+    return _get_news_processor()
 
 # 로깅 설정
 logger = logging.getLogger()
@@ -30,12 +36,32 @@ logger.setLevel(logging.INFO)
 # AWS 클라이언트 초기화
 bedrock_runtime = boto3.client(
     service_name='bedrock-runtime',
-    region_name=os.environ.get('AWS_REGION', 'us-east-1')
+    region_name=os.environ.get('AWS_REGION', 'us-east-1'),
+    config=BOTO3_CLIENT_CONFIG
 )
 
 apigateway = boto3.client('apigatewaymanagementapi',
-    endpoint_url=f"https://{os.environ.get('API_GATEWAY_DOMAIN')}/{os.environ.get('STAGE', 'prod')}"
+    endpoint_url=f"https://{os.environ.get('API_GATEWAY_DOMAIN')}/{os.environ.get('STAGE', 'prod')}",
+    config=BOTO3_CLIENT_CONFIG
+)
+
+# 스트리밍 청크 병합 기준 - 글자 수 또는 경과 시간 중 하나를 넘으면 전송
+STREAM_FLUSH_MIN_CHARS = 200
+STREAM_FLUSH_MAX_DELAY = 0.05  # 초
+
+# Bedrock 스트리밍 요청 본문 템플릿 - 요청마다 달라지는 것은 프롬프트뿐
+# (anthropic_version, max_tokens 4000, temperature 0.1, user 메시지 1개)
+STREAM_REQUEST_BODY_PREFIX = (
+    '{"anthropic_version":"bedrock-2023-05-31","max_tokens":4000,"temperature":0.1,'
+    '"messages":[{"role":"user","content":'
 )
+STREAM_REQUEST_BODY_SUFFIX = '}]}'
+
+# 검색 단계별 상태 메시지
+SEARCH_STATUS_MESSAGES = {
+    "searching": "관련 뉴스를 검색하고 있습니다...",
+    "external_searching": "최신 정보를 추가로 검색하고 있습니다..."
+}
 
 # 환경 변수 - CDK 스택의 실제 값들 사용
 KNOWLEDGE_BASE_ID = os.environ.get('KNOWLEDGE_BASE_ID', 'PGQV3JXPET')
@@ -47,19 +73,20 @@ def handler(event, context):
         connection_id = event['requestContext']['connectionId']
         
         if event['requestContext']['eventType'] == 'MESSAGE':
-        body = json.loads(event.get('body', '{}'))
-        action = body.get('action')
-        
-        if action == 'stream':
-            return handle_stream_request(connection_id, body)
-        else:
+            body = json_loads(event.get('body') or '{}')
+            action = body.get('action')
+            
+            if action == 'stream':
+                return handle_stream_request(connection_id, body)
+            else:
                 return send_error(connection_id, "지원하지 않는 액션입니다.")
         
         return {'statusCode': 200}
             
     except Exception as e:
-        logger.error(f"❌ WebSocket 핸들러 오류: {str(e)}")
-        logger.error(f"❌ Traceback: {traceback.format_exc()}")
+        logger.error("❌ WebSocket 핸들러 오류: %s", e)
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error("❌ Traceback: %s", traceback.format_exc())
         return {'statusCode': 500}
 
 def handle_stream_request(connection_id, data):
@@ -71,7 +98,7 @@ def handle_stream_request(connection_id, data):
         chat_history = data.get('chat_history', [])
         model_id = data.get('modelId', MODEL_ID)
         
-        logger.info(f"🌊 WebSocket 실시간 스트림: user_id={user_id}, input={user_input[:50]}...")
+        logger.info("🌊 WebSocket 실시간 스트림: user_id=%s, input=%s...", user_id, user_input[:50])
         
         if not user_input:
             return send_error(connection_id, "사용자 입력이 필요합니다.")
@@ -80,34 +107,51 @@ def handle_stream_request(connection_id, data):
         news_processor = get_news_processor()
         
         # 실시간 스트리밍 플로우 실행
-        return execute_realtime_streaming_flow(connection_id, news_processor, user_input, chat_history, model_id)
+        try:
+            return execute_realtime_streaming_flow(connection_id, news_processor, user_input, chat_history, model_id)
+        finally:
+            # Lambda 동결 전에 백그라운드 캐시 저장 완료 대기
+            news_processor.wait_for_background_writes()
         
     except Exception as e:
-        logger.error(f"❌ 스트림 요청 처리 오류: {e}")
+        logger.error("❌ 스트림 요청 처리 오류: %s", e)
         return send_error(connection_id, f"처리 중 오류가 발생했습니다: {e}")
 
 def execute_realtime_streaming_flow(connection_id, news_processor, user_input, chat_history, model_id):
     """실시간 스트리밍 플로우 실행 - 상태 메시지와 함께"""
     try:
+        # 🕐 날짜/시간 메타 질문은 검색/생성 없이 완료 청크 하나로 즉시 응답
+        date_meta_answer = news_processor.get_date_meta_answer(user_input)
+        if date_meta_answer is not None:
+            send_stream_chunk(connection_id, date_meta_answer, is_partial=False, is_complete=True)
+            send_status_message(connection_id, "completed", "답변 생성이 완료되었습니다.")
+            return {'statusCode': 200}
+        
+        # ⚡ 동일 질문 캐시 확인 - 적중 시 검색/생성 없이 바로 전송
+        cache_key = news_processor.build_response_cache_key(user_input, chat_history, model_id)
+        cached_response = news_processor.get_cached_response(cache_key)
+        if cached_response is not None:
+            logger.info("⚡ 응답 캐시 적중")
+            send_stream_chunk(connection_id, cached_response, is_partial=True)
+            send_stream_chunk(connection_id, cached_response, is_partial=False, is_complete=True)
+            send_status_message(connection_id, "completed", "답변 생성이 완료되었습니다.")
+            return {'statusCode': 200}
+        
         # 🚀 상태 1: 시작
         send_status_message(connection_id, "processing", "질문을 분석하고 있습니다...")
         
         # 📅 1단계: 날짜 정의 및 질문 보강
         enhanced_query = news_processor.enhance_query_with_date(user_input)
-        logger.info(f"📅 날짜 보강된 질문: {enhanced_query}")
-        
-        # 🔍 상태 2: 검색 시작
-        send_status_message(connection_id, "searching", "관련 뉴스를 검색하고 있습니다...")
-        
-        # 📰 2단계: AWS 내부 지식 검색 (최신순)
-        knowledge_context = news_processor.search_knowledge_base(enhanced_query)
+        logger.info("📅 날짜 보강된 질문: %s", enhanced_query)
         
-        # 🌍 3단계: 필요시 Perplexity API로 보강
-        if news_processor.should_use_external_search(knowledge_context, user_input):
-            send_status_message(connection_id, "external_searching", "최신 정보를 추가로 검색하고 있습니다...")
-            
-            external_context = news_processor.search_external_knowledge(enhanced_query)
-            knowledge_context += f"\n\n[외부 검색 결과]\n{external_context}"
+        # 📰 2-3단계: AWS 내부 지식 검색 (최신순) + 필요시 Perplexity API로 보강
+        # (외부 검색 키워드가 있으면 두 검색 동시 실행, 상태 메시지는 검색 시작 후 전송)
+        knowledge_context, used_external_search = news_processor.collect_knowledge_context(
+            enhanced_query,
+            user_input,
+            status_func=lambda status: send_status_message(connection_id, status, SEARCH_STATUS_MESSAGES[status]),
+            external_header="[외부 검색 결과]"
+        )
         
         # 💭 상태 3: 답변 생성 시작
         send_status_message(connection_id, "generating", "답변을 생성하고 있습니다...")
@@ -115,8 +159,9 @@ def execute_realtime_streaming_flow(connection_id, news_processor, user_input, c
         # 📝 4단계: 최종 프롬프트 구성
         final_prompt = news_processor.build_final_prompt(user_input, chat_history, knowledge_context)
         
-        # 🎨 5단계: 실시간 스트리밍 생성
-        stream_bedrock_response_realtime(connection_id, final_prompt, model_id)
+        # 🎨 5단계: 실시간 스트리밍 생성 (정상 종료된 응답만 반환되어 캐시됨)
+        full_response = stream_bedrock_response_realtime(connection_id, final_prompt, model_id)
+        news_processor.cache_response(cache_key, full_response, used_external_search)
         
         # ✅ 완료 메시지 전송
         send_status_message(connection_id, "completed", "답변 생성이 완료되었습니다.")
@@ -124,52 +169,77 @@ def execute_realtime_streaming_flow(connection_id, news_processor, user_input, c
         return {'statusCode': 200}
         
     except Exception as e:
-        logger.error(f"❌ 실시간 스트리밍 플로우 오류: {e}")
+        logger.error("❌ 실시간 스트리밍 플로우 오류: %s", e)
         return send_error(connection_id, f"스트리밍 중 오류가 발생했습니다: {e}")
 
 def stream_bedrock_response_realtime(connection_id, prompt, model_id):
-    """실시간 Bedrock 스트리밍 응답 - WebSocket으로 즉시 전송"""
+    """
+    실시간 Bedrock 스트리밍 응답 - WebSocket으로 즉시 전송
+    반환: 정상 종료(stop_reason 수신)된 전체 응답, 중간에 끊기거나 오류가 나면 None (캐시 저장 방지)
+    """
     try:
-        # Claude 3 Sonnet용 스트리밍 요청 구성
-        request_body = {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 4000,
-            "temperature": 0.1,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        }
+        # Claude 3 Sonnet용 스트리밍 요청 구성 - 고정 필드는 템플릿, 프롬프트만 직렬화
+        request_body = STREAM_REQUEST_BODY_PREFIX + json_dumps(prompt) + STREAM_REQUEST_BODY_SUFFIX
         
         # 스트리밍 응답 처리
         response = bedrock_runtime.invoke_model_with_response_stream(
             modelId=model_id,
             contentType='application/json',
             accept='application/json',
-            body=json.dumps(request_body)
+            body=request_body
         )
         
         # 실시간으로 클라이언트에 스트리밍 전송
-        full_response = ""
+        # 작은 델타는 모아서 한 번에 전송 (post_to_connection 호출 및 JSON 직렬화 횟수 절감)
+        response_parts = []
+        pending_parts = []
+        pending_chars = 0
+        last_flush = time.monotonic()
+        # Bedrock이 스트림 이벤트로 알려주는 실제 토큰 사용량
+        usage = {"input_tokens": 0, "output_tokens": 0}
+        stop_reason = None
         for event in response['body']:
-            chunk = json.loads(event['chunk']['bytes'])
-            if chunk['type'] == 'content_block_delta':
+            chunk = json_loads(event['chunk']['bytes'])
+            chunk_type = chunk['type']
+            if chunk_type == 'message_start':
+                usage["input_tokens"] = chunk.get('message', {}).get('usage', {}).get('input_tokens', 0)
+            elif chunk_type == 'message_delta':
+                usage["output_tokens"] = chunk.get('usage', {}).get('output_tokens', usage["output_tokens"])
+                stop_reason = chunk.get('delta', {}).get('stop_reason') or stop_reason
+            elif chunk_type == 'content_block_delta':
                 text = chunk['delta'].get('text', '')
                 if text:
-                    full_response += text
-                    # ⚡ 즉시 실시간 청크 전송
-                    send_stream_chunk(connection_id, text, is_partial=True)
+                    response_parts.append(text)
+                    pending_parts.append(text)
+                    pending_chars += len(text)
+                    
+                    now = time.monotonic()
+                    if pending_chars >= STREAM_FLUSH_MIN_CHARS or now - last_flush >= STREAM_FLUSH_MAX_DELAY:
+                        # ⚡ 병합된 실시간 청크 전송
+                        send_stream_chunk(connection_id, "".join(pending_parts), is_partial=True)
+                        pending_parts.clear()
+                        pending_chars = 0
+                        last_flush = now
+        
+        # 남은 청크 전송
+        if pending_parts:
+            send_stream_chunk(connection_id, "".join(pending_parts), is_partial=True)
         
         # 완료된 전체 응답 전송
-        send_stream_chunk(connection_id, full_response, is_partial=False, is_complete=True)
+        full_response = "".join(response_parts)
+        send_stream_chunk(connection_id, full_response, is_partial=False, is_complete=True, usage=usage)
         
-        logger.info(f"실시간 스트리밍 생성 완료: {len(full_response)}자")
+        logger.info("실시간 스트리밍 생성 완료: %s자, 입력 %s토큰, 출력 %s토큰, 종료 사유 %s",
+                    len(full_response), usage["input_tokens"], usage["output_tokens"], stop_reason)
+        if stop_reason is None:
+            logger.warning("스트림이 stop_reason 없이 종료되어 응답을 캐시하지 않습니다.")
+            return None
+        return full_response
             
     except Exception as e:
-        logger.error(f"실시간 스트리밍 생성 오류: {e}")
+        logger.error("실시간 스트리밍 생성 오류: %s", e)
         send_error(connection_id, f"답변 생성 중 오류가 발생했습니다: {e}")
+        return None
 
 def send_status_message(connection_id, status, message):
     """상태 메시지 전송 - 사용자에게 진행 상황 피드백"""
@@ -181,12 +251,12 @@ def send_status_message(connection_id, status, message):
             "timestamp": datetime.now().isoformat()
         }
         send_message(connection_id, status_message)
-        logger.info(f"상태 메시지 전송: {status} - {message}")
+        logger.info("상태 메시지 전송: %s - %s", status, message)
     except Exception as e:
-        logger.error(f"상태 메시지 전송 오류: {e}")
+        logger.error("상태 메시지 전송 오류: %s", e)
 
-def send_stream_chunk(connection_id, content, is_partial=True, is_complete=False):
-    """스트리밍 청크 전송 - 실시간 텍스트 전송"""
+def send_stream_chunk(connection_id, content, is_partial=True, is_complete=False, usage=None):
+    """스트리밍 청크 전송 - 실시간 텍스트 전송 (완료 청크에는 실제 토큰 사용량 포함)"""
     try:
         chunk_message = {
             "type": "stream",
@@ -195,19 +265,21 @@ def send_stream_chunk(connection_id, content, is_partial=True, is_complete=False
             "isComplete": is_complete,
             "timestamp": datetime.now().isoformat()
         }
+        if usage:
+            chunk_message["usage"] = usage
         send_message(connection_id, chunk_message)
     except Exception as e:
-        logger.error(f"스트림 청크 전송 오류: {e}")
+        logger.error("스트림 청크 전송 오류: %s", e)
 
 def send_message(connection_id, message):
     """WebSocket 메시지 전송"""
     try:
         apigateway.post_to_connection(
             ConnectionId=connection_id,
-            Data=json.dumps(message, ensure_ascii=False)
+            Data=json_dumps(message)
         )
     except Exception as e:
-        logger.error(f"메시지 전송 오류: {e}")
+        logger.error("메시지 전송 오류: %s", e)
 
 def send_error(connection_id, error_message):
     """에러 메시지 전송"""
@@ -220,5 +292,5 @@ def send_error(connection_id, error_message):
         send_message(connection_id, error_msg)
         return {'statusCode': 200}
     except Exception as e:
-        logger.error(f"에러 전송 실패: {e}")
+        logger.error("에러 전송 실패: %s", e)
         return {'statusCode': 500}
\ No newline at end of file